@@ -0,0 +1,70 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark for the pipeline entrypoint.
+Spawns fresh interpreters that `import main`, subtracts the cost of a bare
+interpreter start, and fails if the median import overhead exceeds the budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--budget-ms 150]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded just by importing the entrypoint
+HEAVY_MODULES = ["yake", "langdetect", "tldextract", "requests", "bs4"]
+
+
+def _time_interpreter(code, runs):
+    """Return wall-clock milliseconds for each fresh interpreter running `code`"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def loaded_heavy_modules():
+    """Return heavy modules that get imported as a side effect of `import main`"""
+    code = (
+        "import sys, main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+        capture_output=True, text=True,
+    ).stdout.strip()
+    return [m for m in out.split(",") if m]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Cold-start benchmark for main.py")
+    arg_parser.add_argument("--runs", type=int, default=10)
+    arg_parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = arg_parser.parse_args()
+
+    baseline = statistics.median(_time_interpreter("pass", args.runs))
+    with_main = statistics.median(_time_interpreter("import main", args.runs))
+    overhead = with_main - baseline
+    heavy = loaded_heavy_modules()
+
+    print(f"interpreter start: {baseline:.1f} ms (median of {args.runs})")
+    print(f"import main:       {with_main:.1f} ms (median of {args.runs})")
+    print(f"import overhead:   {overhead:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"heavy modules loaded eagerly: {', '.join(heavy) or 'none'}")
+
+    if overhead > args.budget_ms or heavy:
+        print("RESULT: cold-start budget exceeded")
+        sys.exit(1)
+    print("RESULT: within cold-start budget")
+
+
+if __name__ == "__main__":
+    main()
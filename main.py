@@ -2,12 +2,9 @@
 
 import argparse
 import json
+import logging
 import os
 
-from scraper.core.crawler import Crawler
-from scraper.core.parser import Parser
-from scraper.core.enricher import Enricher
-from scraper.core.writer import JSONLWriter
 from scraper.core.logger import Logger
 
 logger = Logger(__name__).get()
@@ -20,44 +17,168 @@ def load_config(path):
         return json.load(f)
 
 
-def run_pipeline(config_path, output_path):
+def open_chunk_sink(chunks_output, memory_budget=None):
+    """Open the chunk sink: Parquet for .parquet paths, JSONL otherwise"""
+    from scraper.core.chunker import CHUNK_SCHEMA
+    from scraper.core.writer import JSONLWriter, ParquetWriter
+
+    if chunks_output.endswith(".parquet"):
+        return ParquetWriter(chunks_output, CHUNK_SCHEMA, hash_key="chunk_hash")
+    return JSONLWriter(
+        chunks_output,
+        overwrite=False,
+        hash_key="chunk_hash",
+        seen_hashes=memory_budget.set("chunk_hashes") if memory_budget else None,
+    )
+
+
+def run_pipeline(config_path, output_path, chunks_output=None, build_index=False,
+                 recrawl=False, state_path=None, page_budget=None, max_memory_mb=None,
+                 workers=None, page_timeout=None, dead_letter_path=None, replay_dead_letter=None):
+    # Pipeline stages pull in requests, BeautifulSoup and the NLP libraries;
+    # import them only when a crawl actually runs to keep startup fast.
+    from scraper.core.crawler import Crawler
+    from scraper.core.parser import Parser
+    from scraper.core.writer import JSONLWriter
+    from scraper.core.metrics import RunMetrics
+    from scraper.core.chunker import Chunker
+    from scraper.core.index import default_index_path
+    from scraper.core.scheduler import RecrawlScheduler
+    from scraper.core.spill import MemoryBudget, peak_rss_mb
+    from scraper.core.isolation import DeadLetterFile, PageProcessor, default_dead_letter_path
+
     # Load config
     config = load_config(config_path)
+    metrics = RunMetrics()
     logger.info(f"Loaded config for site: {config.get('site_name')}")
 
-    # Initialize crawler
-    crawler = Crawler(config)
-    #Initialize the parser
-    parser = Parser(config)
+    # Optional memory budget: visited set, frontier, results and seen hashes spill to disk near the limit
+    memory_budget = MemoryBudget(max_memory_mb, metrics) if max_memory_mb else None
+
+    scheduler = processor = writer = None
+    try:
+        # Initialize crawler
+        crawler = Crawler(config, metrics=metrics, memory_budget=memory_budget)
+        #Initialize the parser
+        parser = Parser(config)
     
-    start_urls = config.get("start_urls", [])
-    max_pages = config["crawl"].get("max_pages")
+        start_urls = config.get("start_urls", [])
+        max_pages = crawler.max_pages
 
-    logger.info(f"Starting crawl: {start_urls} (max_pages={max_pages})")
+        # Recrawl state: per-URL fetch history used to revisit only pages that are due
+        if recrawl:
+            scheduler = RecrawlScheduler.from_config(config, state_path or output_path + ".state")
 
-    # Execute crawl
-    crawled_pages = crawler.crawl(
-        start_urls=start_urls,
-        link_extractor=parser.extract_links,
-    )
-    logger.info(f"Crawl completed. Pages collected: {len(crawled_pages)}")
+        # Pages that fail or time out during processing are recorded here for replay
+        dead_letter_path = dead_letter_path or default_dead_letter_path(output_path)
+        # replaying a file in place: it is swapped for the pages that fail again only once the run completes
+        replay_in_place = bool(replay_dead_letter) and os.path.abspath(replay_dead_letter) == os.path.abspath(dead_letter_path)
+        dead_letter = DeadLetterFile(dead_letter_path, replace=replay_in_place)
 
-    # Initialize writer
-    writer = JSONLWriter(output_path, overwrite=False)
+        if replay_dead_letter:
+            replay_urls = list(dict.fromkeys(entry["url"] for entry in DeadLetterFile.load(replay_dead_letter)))
+            logger.info(f"Replaying {len(replay_urls)} dead-lettered pages from {replay_dead_letter}")
+            crawled_pages = crawler.fetch_many(replay_urls)
+            for url in replay_urls:
+                if url not in crawled_pages:
+                    dead_letter.record(url, "fetch", "fetch failed during replay")
+        elif scheduler and scheduler.count():
+            budget = page_budget if page_budget is not None else max_pages
+            due = scheduler.due(budget)
+            logger.info(f"Starting recrawl: {len(due)} of {scheduler.count()} known pages due (budget={budget})")
+            # pages the config no longer allows are dropped from the state rather than refetched
+            excluded = {url for url in due if not crawler.url_filter.allows(url)}
+            for url in excluded:
+                scheduler.forget(url)
+            crawled_pages = crawler.fetch_many(due)
+            for url in set(due) - set(crawled_pages) - excluded:
+                scheduler.defer(url)
 
-    #Initialize enricher for AI relevant signal
-    enricher = Enricher(config)
+            # discovery: revisit the start URLs and follow links to pages with no history, within the remaining budget;
+            # start URLs that were just fetched as due are reused rather than refetched
+            remaining = budget - len(due)
+            if remaining > 0:
+                discovered = crawler.crawl(
+                    start_urls=start_urls,
+                    link_extractor=parser.extract_links,
+                    max_pages=remaining,
+                    skip=scheduler.known,
+                    prefetched=crawled_pages,
+                )
+                for url, html in discovered.items():
+                    crawled_pages[url] = html
+        else:
+            logger.info(f"Starting crawl: {start_urls} (max_pages={max_pages})")
 
-    # Parse - Enrich - Write
-    for url, html in crawled_pages.items():
-        try:
-            parsed = parser.parse(html, url)
-            enriched = enricher.enrich(parsed)
-            writer.write(enriched)
-        except Exception as e:
-            logger.error(f"Pipeline error on {url}: {e}")
+            # Execute crawl
+            crawled_pages = crawler.crawl(
+                start_urls=start_urls,
+                link_extractor=parser.extract_links,
+            )
+        logger.info(f"Crawl completed. Pages collected: {len(crawled_pages)}")
 
-    writer.close()
+        # Initialize writer
+        writer = JSONLWriter(
+            output_path,
+            overwrite=False,
+            index_path=default_index_path(output_path) if build_index else None,
+            seen_hashes=memory_budget.set("seen_hashes") if memory_budget else None,
+        )
+
+        # Parse + enrich run in worker processes with a per-page time limit
+        processor = PageProcessor.from_config(
+            config, metrics=metrics, dead_letter=dead_letter, workers=workers, page_timeout=page_timeout
+        )
+
+        # Optional passage chunking for embedding; only new/changed chunks are written
+        chunker = Chunker.from_config(config) if chunks_output else None
+        chunk_writer = open_chunk_sink(chunks_output, memory_budget) if chunks_output else None
+
+        # Parse - Enrich - Write (- Chunk)
+        # during a recrawl, pages whose parsed content is unchanged skip enrichment (enriched is None)
+        known_hash = scheduler.last_hash if scheduler else None
+        for url, enriched in processor.process(crawled_pages.items(), known_hash=known_hash):
+            try:
+                # only changed content produces new records during a recrawl
+                if enriched is None or (scheduler and not scheduler.changed(url, enriched["content_hash"])):
+                    scheduler.record(url, scheduler.last_hash(url))
+                    metrics.incr("recrawl_unchanged")
+                    continue
+                writer.write(enriched)
+                if chunker:
+                    for chunk in chunker.chunk(enriched):
+                        written = chunk_writer.write(chunk)
+                        metrics.incr("chunks_written" if written else "chunks_unchanged")
+                # recorded only once written, so a failed write is retried as changed next run
+                if scheduler:
+                    scheduler.record(url, enriched["content_hash"])
+            except Exception as e:
+                logger.error(f"Pipeline error on {url}: {e}", extra={"url": url, "stage": "write"})
+                dead_letter.record(url, "write", f"{type(e).__name__}: {e}")
+
+        processor.close()
+        if chunk_writer:
+            chunk_writer.close()
+            logger.info(f"Chunks saved to: {chunks_output}")
+        dead_letter.close()
+        if dead_letter.count:
+            logger.warning(f"{dead_letter.count} pages dead-lettered to {dead_letter_path} (re-run them with --replay-dead-letter)")
+    finally:
+        # also on errors and Ctrl-C: stop the workers, release state and remove the spill directory
+        if processor:
+            processor.close(terminate=True)
+        if writer:
+            writer.close()
+        if scheduler:
+            scheduler.close()
+        if memory_budget:
+            memory_budget.close()
+
+    peak_rss = peak_rss_mb()
+    if peak_rss is not None:
+        metrics.gauge_max("rss_peak_mb", round(peak_rss, 1))
+    for line in metrics.summary():
+        logger.info(f"Metrics: {line}")
     logger.info(f"Pipeline complete. Output saved to: {output_path}")
 
 
@@ -78,8 +199,118 @@ def cli():
         help="Output .jsonl file (e.g., output/medlineplus.jsonl)",
     )
 
+    arg_parser.add_argument(
+        "--chunks-output",
+        default=None,
+        help="Optional .jsonl or .parquet file for passage chunks (window set by 'chunking' in the config)",
+    )
+
+    arg_parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Maintain an inverted index (<output>.idx) for `python -m scraper.query`",
+    )
+
+    arg_parser.add_argument(
+        "--recrawl",
+        action="store_true",
+        help="Revisit only pages that are due based on their estimated change rate (first run does a full crawl)",
+    )
+
+    arg_parser.add_argument(
+        "--state",
+        default=None,
+        help="Recrawl state file (default: <output>.state)",
+    )
+
+    arg_parser.add_argument(
+        "--page-budget",
+        type=int,
+        default=None,
+        help="Maximum pages to revisit per recrawl run (default: crawl.max_pages)",
+    )
+
+    arg_parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=None,
+        help="Memory budget in MB; crawl state and dedup hashes spill to a temporary SQLite file as RSS nears it",
+    )
+
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for parse/enrich (default: processing.workers or 2; 0 runs in-process without timeouts)",
+    )
+
+    arg_parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=None,
+        help="Seconds a page may spend in parse/enrich before it is skipped (default: processing.page_timeout or 30)",
+    )
+
+    arg_parser.add_argument(
+        "--dead-letter",
+        default=None,
+        help="JSONL file for pages that failed or timed out (default: <output>.dead.jsonl)",
+    )
+
+    arg_parser.add_argument(
+        "--replay-dead-letter",
+        default=None,
+        help="Refetch and reprocess the URLs listed in a dead-letter file instead of crawling",
+    )
+
+    arg_parser.add_argument(
+        "--log-queue",
+        action="store_true",
+        help="Write logs from a background thread via a queue instead of blocking the crawl loop",
+    )
+
+    arg_parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Write structured JSON lines (url, depth, status, latency_ms, stage) to the log file",
+    )
+
+    arg_parser.add_argument(
+        "--log-debug-sample",
+        type=float,
+        default=None,
+        help="Enable DEBUG logging and keep only this fraction of debug records (e.g., 0.05)",
+    )
+
+    arg_parser.add_argument(
+        "--log-dedupe-window",
+        type=float,
+        default=0.0,
+        help="Seconds during which repeated warnings/errors are suppressed (e.g., during retry storms)",
+    )
+
     args = arg_parser.parse_args()
-    run_pipeline(args.config, args.output)
+    Logger.configure(
+        queue_mode=args.log_queue,
+        json_format=args.log_json,
+        debug_sample_rate=args.log_debug_sample if args.log_debug_sample is not None else 1.0,
+        dedupe_window=args.log_dedupe_window,
+        level=logging.DEBUG if args.log_debug_sample is not None else logging.INFO,
+    )
+    run_pipeline(
+        args.config,
+        args.output,
+        chunks_output=args.chunks_output,
+        build_index=args.index,
+        recrawl=args.recrawl,
+        state_path=args.state,
+        page_budget=args.page_budget,
+        max_memory_mb=args.max_memory_mb,
+        workers=args.workers,
+        page_timeout=args.page_timeout,
+        dead_letter_path=args.dead_letter,
+        replay_dead_letter=args.replay_dead_letter,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+# scraper/core/chunker.py
+
+import hashlib
+
+
+# Column types used when chunks are written to Parquet
+CHUNK_SCHEMA = [
+    ("chunk_hash", "string"),
+    ("url", "string"),
+    ("content_hash", "string"),
+    ("chunk_index", "int64"),
+    ("heading", "string"),
+    ("text", "string"),
+    ("char_count", "int64"),
+    ("token_count", "int64"),
+]
+
+
+class Chunker:
+    """
+    Split enriched page records into passages for embedding / RAG ingestion.
+
+    Chunks are built from the newline-separated blocks of body_text so a
+    block is only split when it is larger than the window on its own.
+    Headings (from the parsed record) always start a new chunk and are
+    carried on every chunk of their section. Consecutive chunks share up to
+    `overlap` units of trailing blocks.
+    """
+
+    def __init__(self, size=200, overlap=40, unit="tokens"):
+        if unit not in ("tokens", "chars"):
+            raise ValueError(f"Unknown chunk unit: '{unit}' (expected 'tokens' or 'chars')")
+        if size <= 0 or not 0 <= overlap < size:
+            raise ValueError("Chunk size must be positive and overlap smaller than size")
+        self.size = size
+        self.overlap = overlap
+        self.unit = unit
+
+    @classmethod
+    def from_config(cls, config):
+        cfg = config.get("chunking", {})
+        return cls(
+            size=cfg.get("size", 200),
+            overlap=cfg.get("overlap", 40),
+            unit=cfg.get("unit", "tokens"),
+        )
+
+    def _measure(self, text):
+        return len(text.split()) if self.unit == "tokens" else len(text)
+
+    def _split(self, block):
+        """Window a single oversized block with overlap"""
+        step = self.size - self.overlap
+        if self.unit == "tokens":
+            tokens = block.split()
+            return [" ".join(tokens[i:i + self.size]) for i in range(0, len(tokens) - self.overlap, step)]
+        return [block[i:i + self.size] for i in range(0, len(block) - self.overlap, step)]
+
+    def _overlap_tail(self, blocks):
+        """Trailing blocks whose combined size fits within the overlap"""
+        tail, size = [], 0
+        for block in reversed(blocks):
+            size += self._measure(block)
+            if size > self.overlap:
+                break
+            tail.insert(0, block)
+        return tail
+
+    def _record(self, parent, index, heading, blocks):
+        text = "\n".join(blocks)
+        url = parent.get("url", "")
+        return {
+            # keyed on url + text so identical passages on different pages stay distinct
+            "chunk_hash": hashlib.sha256(f"{url}\n{text}".encode("utf-8")).hexdigest(),
+            "url": url,
+            "content_hash": parent.get("content_hash"),
+            "chunk_index": index,
+            "heading": heading,
+            "text": text,
+            "char_count": len(text),
+            "token_count": len(text.split()),
+        }
+
+    def chunk(self, record):
+        """Yield chunk records for one enriched page record"""
+        headings = set(record.get("headings") or [])
+        blocks = [line.strip() for line in (record.get("body_text") or "").split("\n") if line.strip()]
+
+        index = 0
+        heading = None
+        current, current_size = [], 0
+        # the heading line alone never forms a chunk
+        only_heading = False
+
+        for block in blocks:
+            if block in headings:
+                if current and not only_heading:
+                    yield self._record(record, index, heading, current)
+                    index += 1
+                heading = block
+                current, current_size = [block], self._measure(block)
+                only_heading = True
+                continue
+
+            pieces = self._split(block) if self._measure(block) > self.size else [block]
+            for piece in pieces:
+                size = self._measure(piece)
+                if current and not only_heading and current_size + size > self.size:
+                    yield self._record(record, index, heading, current)
+                    index += 1
+                    current = self._overlap_tail(current)
+                    current_size = sum(self._measure(b) for b in current)
+                    if current_size + size > self.size:
+                        current, current_size = [], 0
+                current.append(piece)
+                current_size += size
+                only_heading = False
+
+        if current and not only_heading:
+            yield self._record(record, index, heading, current)
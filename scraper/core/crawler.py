@@ -1,52 +1,168 @@
 # scraper/core/crawler.py
 
+import re
 import time
 from urllib.parse import urljoin, urlparse
-import requests
 from collections import deque
 from scraper.core.logger import Logger
+from scraper.core.metrics import RunMetrics
+from scraper.core.url_filter import UrlFilter
+
+
+DEFAULT_CONTENT_TYPES = ["text/html", "application/xhtml+xml"]
+# URLs ending in these are checked with a HEAD request before downloading
+DEFAULT_HEAD_CHECK_EXTENSIONS = [
+    ".pdf", ".zip", ".gz", ".swf", ".mp3", ".mp4", ".avi", ".mov",
+    ".jpg", ".jpeg", ".png", ".gif", ".svg", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+]
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
 
 
 class Crawler:
-    def __init__(self, config):
-        self.allowed_domains = config["allowed_domains"]
-        self.exclude_patterns = config["crawl"].get("exclude_patterns", [])
-        self.include_patterns = config["crawl"].get("include_patterns", [""])
+    def __init__(self, config, metrics=None, memory_budget=None):
+        # imported here so config-only commands don't pay for requests/urllib3
+        from scraper.core.transport import build_session
+
+        self.url_filter = UrlFilter.from_config(config)
         self.min_depth = config["crawl"].get("min_depth", 0)
         self.max_depth = config["crawl"].get("max_depth", 1)
         self.max_pages = config["crawl"].get("max_pages", 100)
+        self.max_body_bytes = config["crawl"].get("max_body_bytes", 5_000_000)
+        self.allowed_content_types = config["crawl"].get("allowed_content_types", DEFAULT_CONTENT_TYPES)
+        self.head_check_extensions = tuple(
+            config["crawl"].get("head_check_extensions", DEFAULT_HEAD_CHECK_EXTENSIONS)
+        )
         self.logger = Logger(__name__).get()
-        self.visited = set()
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "multi-site-scraper/1.0 (+https://github.com/shriyaRam/multi-site-scraper)"
-        })
+        self.metrics = metrics or RunMetrics()
+        # with a memory budget, crawl state spills to disk once RSS nears the limit
+        self.memory_budget = memory_budget
+        self.visited = memory_budget.set("visited") if memory_budget else set()
+        self.session = build_session(config, self.metrics)
 
     def _allowed_domain(self, url):
-        """Check if URL belongs to allowed domains"""
-        hostname = urlparse(url).hostname or ""
-        return any(domain in hostname for domain in self.allowed_domains)
+        """Check if URL belongs to allowed domains (exact host or subdomain)"""
+        return self.url_filter.allowed_domain(url)
 
     def _excluded(self, url):
         """Check patterns that are not allowed in the URL"""
-        return any(pattern in url for pattern in self.exclude_patterns)
+        return self.url_filter.excluded(url)
 
     def _included(self, url):
         """Check if pattern matches the explicitly listed URL patterns
         (optional, can restrict scraping to only certain endpoints)"""
-        return any(keyword in url for keyword in self.include_patterns)
+        return self.url_filter.included(url)
+
+    def _html_content_type(self, headers):
+        """Check the Content-Type header against allowed types (missing header is allowed)"""
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        return not content_type or content_type in self.allowed_content_types
+
+    def _too_large(self, headers):
+        """Check a declared Content-Length against the body size cap"""
+        length = headers.get("Content-Length")
+        return bool(length and length.isdigit() and int(length) > self.max_body_bytes)
+
+    def _head_allows(self, url):
+        """
+        Send a HEAD request for URLs with suspicious extensions.
+        Returns False only when the server confirms a non-HTML or oversized body.
+        """
+        try:
+            resp = self.session.head(url, timeout=10, allow_redirects=True)
+        except Exception as e:
+            self.logger.debug(f"HEAD failed for {url}: {e}", extra={"url": url, "stage": "fetch"})
+            return True
+        if not resp.ok:
+            # some servers reject HEAD; let the GET decide
+            return True
+        return self._html_content_type(resp.headers) and not self._too_large(resp.headers)
+
+    def _read_body(self, resp):
+        """Stream the body in chunks, giving up once it exceeds max_body_bytes"""
+        chunks = []
+        size = 0
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_body_bytes:
+                return None
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def _decode(self, body, headers):
+        """
+        Decode raw bytes using the charset from the Content-Type header,
+        then a <meta charset> in the document head, falling back to UTF-8
+        """
+        match = _HEADER_CHARSET.search(headers.get("Content-Type", ""))
+        if not match:
+            match = _META_CHARSET.search(body[:4096])
+        encoding = match.group(1) if match else "utf-8"
+        if isinstance(encoding, bytes):
+            encoding = encoding.decode("ascii", "ignore")
+        try:
+            return body.decode(encoding, errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
+
+    def _skip(self, url, reason):
+        """
+        Log a non-retryable skip (wrong content type, body too large) and mark
+        the URL visited: the outcome is deterministic, so rediscovered links
+        are not checked again
+        """
+        self.logger.info(f"Skipping {url}: {reason}", extra={"url": url, "stage": "fetch"})
+        self.visited.add(url)
 
     def fetch(self, url, retries=3):
-        """Fetch HTML with retries and throttling"""
+        """
+        Fetch HTML with retries and throttling.
+        The body is streamed so non-HTML or oversized responses are dropped
+        before being downloaded in full.
+        """
+        if urlparse(url).path.lower().endswith(self.head_check_extensions) and not self._head_allows(url):
+            self._skip(url, "HEAD reports non-HTML or oversized content")
+            return None
+
         for attempt in range(1, retries + 1):
             try:
-                resp = self.session.get(url, timeout=10)
-                resp.raise_for_status()
+                start = time.perf_counter()
+                resp = self.session.get(url, timeout=10, stream=True)
+                # with stream=True, elapsed stops once the response headers arrive
+                if getattr(resp, "elapsed", None) is not None:
+                    self.metrics.observe("http_ttfb_ms", resp.elapsed.total_seconds() * 1000)
+                try:
+                    resp.raise_for_status()
+                    if not self._html_content_type(resp.headers):
+                        self._skip(url, f"content type {resp.headers.get('Content-Type')}")
+                        return None
+                    body = None if self._too_large(resp.headers) else self._read_body(resp)
+                    if body is None:
+                        self._skip(url, f"body exceeds {self.max_body_bytes} bytes")
+                        return None
+                    html = self._decode(body, resp.headers)
+                finally:
+                    resp.close()
+
+                latency_ms = (time.perf_counter() - start) * 1000
+                self.metrics.observe("fetch_ms", latency_ms)
+                self.logger.debug(
+                    f"Fetched: {url} ({resp.status_code})",
+                    extra={
+                        "url": url,
+                        "status": resp.status_code,
+                        "latency_ms": round(latency_ms, 1),
+                        "stage": "fetch",
+                    },
+                )
                 #polite delay to avoid overloading the server and risk being blocked
                 time.sleep(0.7)  
-                return resp.text
+                return html
             except Exception as e:
-                self.logger.error(f"Fetch failed ({attempt}/{retries}) for {url}: {e}")
+                self.logger.error(
+                    f"Fetch failed ({attempt}/{retries}) for {url}: {e}",
+                    extra={"url": url, "stage": "fetch", "dedupe_key": f"fetch:{type(e).__name__}"},
+                )
                 time.sleep(1)
 
         return None
@@ -62,16 +178,48 @@ class Crawler:
             self.logger.error(f"Link extraction error: {e}")
             return set()
 
-    def crawl(self, start_urls, link_extractor):
+    def _queue(self, items):
+        """Crawl frontier: a deque, or a spillable queue under a memory budget"""
+        return self.memory_budget.queue("frontier", items) if self.memory_budget else deque(items)
+
+    def _results(self):
+        """{url: html} results: a dict, or a spillable dict under a memory budget"""
+        return self.memory_budget.dict("results") if self.memory_budget else {}
+
+    def fetch_many(self, urls):
+        """
+        Fetch a fixed list of URLs without following links (used for recrawls)
+        Returns a dict of {url: html} for the pages that were fetched
+        """
+        results = self._results()
+        for url in urls:
+            if not self.url_filter.allows(url):
+                self.logger.info(f"Skipping {url}: excluded by the crawl config", extra={"url": url, "stage": "recrawl"})
+                continue
+            self.logger.info(f"Recrawling: {url}", extra={"url": url, "stage": "recrawl"})
+            html = self.fetch(url)
+            if html:
+                results[url] = html
+        return results
+
+    def crawl(self, start_urls, link_extractor, max_pages=None, skip=None, prefetched=None):
         """
         BFS crawl starting from start_url(s)
         link_extractor: function that extracts links from HTML
+        max_pages: page limit for this crawl (default: crawl.max_pages)
+        skip: optional predicate; discovered links for which it returns True are not followed
+        prefetched: {url: html} already fetched this run; their links are followed
+            without refetching, and they are not returned or counted again
         Returns a dict of {url: html}
         """
-        queue = deque([(url, 0) for url in start_urls])
-        results = {}
-
-        while queue and len(results) < self.max_pages:
+        max_pages = self.max_pages if max_pages is None else max_pages
+        # URLs are filtered before they enter the queue, so dequeued URLs need no further checks
+        queue = self._queue([(url, 0) for url in start_urls if self.url_filter.allows(url)])
+        results = self._results()
+
+        while queue and len(results) < max_pages:
+            if self.memory_budget:
+                self.memory_budget.enforce()
             url, depth = queue.popleft()
 
             if url in self.visited:
@@ -80,28 +228,26 @@ class Crawler:
             if depth > self.max_depth:
                 continue
 
-            if not self._allowed_domain(url):
-                continue
-            if self._excluded(url):
-                continue
-            if not self._included(url):
-                continue
-
-            self.logger.info(f"Crawling: {url} (depth {depth})")
+            reused = prefetched is not None and url in prefetched
+            self.logger.info(
+                f"{'Following links from' if reused else 'Crawling'}: {url} (depth {depth})",
+                extra={"url": url, "depth": depth, "stage": "crawl"},
+            )
 
-            html = self.fetch(url)
+            html = prefetched[url] if reused else self.fetch(url)
             if not html:
                 continue
 
-            if depth >= self.min_depth:
+            if depth >= self.min_depth and not reused:
                 results[url] = html
             self.visited.add(url)
 
             # Extract links for crawling
             if depth < self.max_depth:
                 discovered_links = self.extract_links(html, url, link_extractor)
+                allows = self.url_filter.allows
                 for link in discovered_links:
-                    if link not in self.visited:
+                    if link not in self.visited and allows(link) and not (skip and skip(link)):
                         queue.append((link, depth + 1))
 
         return results
\ No newline at end of file
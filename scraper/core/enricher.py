@@ -1,50 +1,60 @@
 # scraper/core/enricher.py
 
 import time
-import re
 import hashlib
-import tldextract
-from collections import Counter
-from langdetect import detect, LangDetectException
-import yake
+from functools import lru_cache
+from scraper.core.language import LanguageDetector
+from scraper.core.textstats import TextStats, batch_readability
+
+
+# Heavy NLP dependencies (yake, tldextract; langdetect lives in language.py) are imported on first
+# use so that importing the pipeline stays cheap for commands that never enrich.
+
+@lru_cache(maxsize=None)
+def _domain_extractor():
+    """Build tldextract once from its bundled suffix-list snapshot (never fetches over the network)"""
+    import tldextract
+    return tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+@lru_cache(maxsize=None)
+def _keyword_extractor(top_k):
+    """Return a shared YAKE extractor for the given keyword count"""
+    import yake
+    return yake.KeywordExtractor(top=top_k)
+
+
 class Enricher:
     """
     Enrich parsed page data with AI-friendly metadata such as
     language, keywords, summary, readability, and domain signals
     """
 
-    def __init__(self, config):
+    def __init__(self, config, metrics=None):
         self.cfg = config.get("enrichment", {})
         self.top_k = self.cfg.get("topk_keyword_count", 10)
         self.content_type = self.cfg.get("content_type", "generic")
         self.topic_labels = self.cfg.get("topic_labels", ["general"])
+        self.metrics = metrics
+        self.language_detector = LanguageDetector.from_config(config, metrics=metrics)
 
 
-    def _safe_lang(self, text, default="en"):
-        """Detect language with fallback"""
-        try:
-            return detect(text) if len(text) > 25 else default
-        except LangDetectException:
-            return default
+    def _safe_lang(self, text, content_hash=None):
+        """Detect language with fallback (cached per content_hash)"""
+        return self.language_detector.detect(text, content_hash=content_hash)
 
     def _sentence_count(self, text):
         """Approximate sentence count using punctuation splits"""
-        parts = re.split(r"[.!?]+", text)
-        return max(1, len([p for p in parts if p.strip()]))
+        return TextStats(text).sentence_count
 
     def _extract_domain(self, url):
         """Return root domain for the URL"""
-        ext = tldextract.extract(url)
+        ext = _domain_extractor()(url)
         return f"{ext.domain}.{ext.suffix}"
 
     def _redundancy_penalty(self, text):
         """Compute fraction of repeated paragraphs"""
-        paras = [p.strip() for p in text.split("\n") if p.strip()]
-        if not paras:
-            return 0.0
-        counts = Counter(paras)
-        repeats = sum(v - 1 for v in counts.values() if v > 1)
-        return repeats / len(paras)
+        return TextStats(text).redundancy
 
     def _readability(self, text):
         """
@@ -52,41 +62,18 @@ class Enricher:
         avg sentence length, avg word length, redundancy penalty
         Lower score = easier to read, higher score = more complex
         """
-        words = re.findall(r"\w+", text)
-        if not words:
-            return 0.0
-
-        avg_word_len = sum(len(w) for w in words) / len(words)
-        avg_sent_len = len(words) / self._sentence_count(text)
-        penalty = self._redundancy_penalty(text)
-
-        score = (
-            0.4 * avg_sent_len +
-            0.4 * avg_word_len +
-            0.2 * penalty
-        )
-
-        return round(score, 3)
+        return TextStats(text).readability
 
     def _extract_keywords(self, text):
         """
         Extract keywords to represent the extracted text
         """
-        kw_extractor = yake.KeywordExtractor(top=self.top_k)
+        kw_extractor = _keyword_extractor(self.top_k)
         return [kw for kw, score in kw_extractor.extract_keywords(text)]
 
     def _extract_questions(self, text, max_q=5):
         """Return questions found in the body text"""
-        qpattern = re.compile(r"^(what|why|how|when|where|who|which|can|does|do)\b", re.IGNORECASE)
-        lines = text.split("\n")
-
-        qs = []
-        for line in lines:
-            clean = line.strip()
-            if clean.endswith("?") and qpattern.match(clean):
-                qs.append(clean)
-
-        return qs[:max_q]
+        return TextStats(text).questions[:max_q]
 
     def _summary(self, parsed, max_chars=350):
         """return an initial substring of the description if available; fallback: truncate body"""
@@ -99,18 +86,21 @@ class Enricher:
         clean = " ".join(body.split())
         return clean[:max_chars].rstrip() + ("..." if len(clean) > max_chars else "")
     
-    def enrich(self, parsed):
-        """
-        Return AI-friendly enriched JSON object
-        by combining parsed fields + metadata signals
-        """
+    @staticmethod
+    def content_hash(parsed):
+        """Hash of the parsed body text; identifies unchanged content across fetches"""
+        text = parsed.get("body_text", "") or ""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _build(self, parsed, stats, readability):
+        """Assemble the enriched record from precomputed text statistics"""
         text = parsed.get("body_text", "") or ""
         url = parsed.get("url", "")
-        words = text.split()
-        wcount = len(words)
+        wcount = stats.tokens
+        content_hash = self.content_hash(parsed)
 
         enriched = {
-            "content_hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "content_hash": content_hash,
             "word_count": wcount,
             "char_count": len(text),
             "text_length": (
@@ -119,15 +109,34 @@ class Enricher:
                 "long" if wcount < 2000 else
                 "very_long"
             ),
-            "readability_score": self._readability(text),
+            "readability_score": readability,
             "source_domain": self._extract_domain(url),
-            "language": self._safe_lang(text),
+            "language": self._safe_lang(text, content_hash),
             "keywords": self._extract_keywords(text),
             "content_type": self.content_type,
             "summary": self._summary(parsed),
-            "questions": self._extract_questions(text),
+            "questions": stats.questions[:5],
             "fetched_at": int(time.time())
         }
 
         # merge parsed fields and enrichment fields
-        return {**parsed, **enriched}
\ No newline at end of file
+        return {**parsed, **enriched}
+
+    def enrich(self, parsed):
+        """
+        Return AI-friendly enriched JSON object
+        by combining parsed fields + metadata signals
+        """
+        stats = TextStats(parsed.get("body_text", "") or "")
+        return self._build(parsed, stats, stats.readability)
+
+    def enrich_batch(self, parsed_docs):
+        """
+        Enrich many parsed documents at once.
+        Text statistics are gathered per document and the readability math
+        is vectorized across the batch.
+        """
+        parsed_docs = list(parsed_docs)
+        stats = [TextStats(doc.get("body_text", "") or "") for doc in parsed_docs]
+        scores = batch_readability(stats)
+        return [self._build(doc, st, score) for doc, st, score in zip(parsed_docs, stats, scores)]
@@ -0,0 +1,181 @@
+# scraper/core/extraction.py
+
+import importlib
+
+import soupsieve
+from bs4 import Tag
+
+
+class CompiledSelector:
+    """
+    Pre-parsed CSS selector with a cheap pre-check on the tag name, id and
+    classes of the rightmost compound, so the full soupsieve match only runs
+    on elements that could possibly match.
+    """
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.compiled = soupsieve.compile(selector)
+        self._keys = []
+        for sel in self.compiled.selectors:
+            name = (sel.tag.name if sel.tag else "*").lower()
+            ids = {i.lower() for i in sel.ids}
+            classes = {c.lower() for c in sel.classes}
+            self._keys.append((None if name == "*" else name, ids, classes))
+
+    def _could_match(self, el):
+        for name, ids, classes in self._keys:
+            if name is not None and el.name.lower() != name:
+                continue
+            if ids and (el.get("id") or "").lower() not in ids:
+                continue
+            if classes and not classes.issubset(c.lower() for c in el.get("class", [])):
+                continue
+            return True
+        return False
+
+    def match(self, el):
+        return self._could_match(el) and self.compiled.match(el)
+
+    def select_one(self, soup):
+        return self.compiled.select_one(soup)
+
+
+def _compile(selector):
+    return CompiledSelector(selector) if selector else None
+
+
+def load_plugin(spec):
+    """
+    Load a per-site plugin from "package.module:function".
+    The function is called as plugin(soup, record) and returns a dict of extra fields.
+    """
+    if not spec:
+        return None
+    module_name, _, func_name = spec.partition(":")
+    if not func_name:
+        raise ValueError(f"Plugin must be given as 'module:function', got '{spec}'")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+class FieldSpec:
+    """
+    Declarative extra field from the config "fields" section, either
+    "name": "css selector" or
+    "name": {"selector": "css selector", "attr": "href", "many": true}
+    """
+
+    def __init__(self, name, spec):
+        if isinstance(spec, str):
+            spec = {"selector": spec}
+        self.name = name
+        self.selector = _compile(spec["selector"])
+        self.attr = spec.get("attr")
+        self.many = spec.get("many", False)
+
+    def value(self, elements, clean):
+        """Text (cleaned) or attribute value of the matched element(s)"""
+        values = []
+        for el in elements:
+            value = el.get(self.attr) if self.attr else clean(el.get_text(" ", strip=True))
+            if value:
+                values.append(value.strip() if isinstance(value, str) else value)
+        if self.many:
+            return values
+        return values[0] if values else None
+
+
+class PlanMatches:
+    """Elements and content blocks found by one ExtractionPlan traversal"""
+
+    def __init__(self, fields):
+        self.title = None
+        self.page_title = None
+        self.description = None
+        self.meta_description = None
+        self.blocks = []
+        self.fields = {spec.name: [] for spec in fields}
+
+
+class ExtractionPlan:
+    """
+    Site config compiled once into pre-parsed CSS selectors, executed in a
+    single traversal of the DOM:
+    - title / description selectors (first match) and their fallbacks
+    - content_containers + content_tags for the main text blocks (ordered by
+      selector, then container, with nested matches repeated, as select() would)
+    - extra declarative "fields"
+    - optional "plugin" hook (module:function) run after extraction
+    """
+
+    def __init__(self, selectors, fields=None, plugin=None):
+        self.title = _compile(selectors.get("title"))
+        self.description = _compile(selectors.get("description"))
+        self.containers = [_compile(s) for s in selectors.get("content_containers", [])]
+        self.content_tags = set(selectors.get("content_tags", ["p"]))
+        self.fields = [FieldSpec(name, spec) for name, spec in (fields or {}).items()]
+        self.plugin = load_plugin(plugin)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.get("selectors", {}),
+            fields=config.get("fields"),
+            plugin=config.get("plugin"),
+        )
+
+    def execute(self, soup):
+        """Walk the document once and collect everything the plan needs"""
+        found = PlanMatches(self.fields)
+        # id(container element) -> [(selector index, document position)] for each selector it matches
+        containers = {}
+        # (selector index, container position, element position, tag name, text)
+        entries = []
+        paragraphs = []
+
+        for position, el in enumerate(soup.descendants):
+            if not isinstance(el, Tag):
+                continue
+
+            name = el.name
+            if found.title is None and self.title and self.title.match(el):
+                found.title = el
+            if found.page_title is None and name == "title":
+                found.page_title = el
+            if found.description is None and self.description and self.description.match(el):
+                found.description = el
+            if found.meta_description is None and name == "meta" and el.get("name") == "description":
+                found.meta_description = el
+
+            for spec in self.fields:
+                matches = found.fields[spec.name]
+                if (spec.many or not matches) and spec.selector.match(el):
+                    matches.append(el)
+
+            # parents are always visited first, so enclosing containers are known;
+            # an element is emitted once per enclosing container match, as select() + find_all() would
+            if name in self.content_tags and containers:
+                keys = [key for p in el.parents for key in containers.get(id(p), ())]
+                if keys:
+                    text = el.get_text(" ", strip=True)
+                    if text:
+                        entries.extend((sel, pos, position, name, text) for sel, pos in keys)
+            matched = [(i, position) for i, c in enumerate(self.containers) if c.match(el)]
+            if matched:
+                containers[id(el)] = matched
+
+            if name == "p":
+                paragraphs.append(el)
+
+        # order blocks by container selector, then container, then document order
+        entries.sort(key=lambda entry: entry[:3])
+        found.blocks = [(name, text) for _, _, _, name, text in entries]
+
+        # fallback: all <p> tags if nothing extracted
+        if not found.blocks:
+            for el in paragraphs:
+                text = el.get_text(" ", strip=True)
+                if text:
+                    found.blocks.append((el.name, text))
+
+        return found
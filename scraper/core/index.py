@@ -0,0 +1,199 @@
+# scraper/core/index.py
+
+import hashlib
+import json
+import os
+import sqlite3
+
+
+# Categorical record fields that get posting lists (value -> byte offsets)
+INDEXED_FIELDS = ("keywords", "language", "text_length", "source_domain")
+
+
+def default_index_path(output_path):
+    return output_path + ".idx"
+
+
+def file_fingerprint(jsonl_path):
+    """Identify a JSONL file by inode and a hash of its first line, so a replaced or rewritten file is detected"""
+    if not os.path.exists(jsonl_path):
+        return None
+    with open(jsonl_path, "rb") as f:
+        first_line = f.readline()
+    return f"{os.stat(jsonl_path).st_ino}:{hashlib.sha256(first_line).hexdigest()}"
+
+
+class OutputIndex:
+    """
+    On-disk inverted index over a JSONL output file, stored in SQLite.
+    Maps keywords, language, text_length and source_domain values to the
+    byte offset of each record so queries can seek straight to matching
+    lines instead of loading the whole file.
+    """
+
+    def __init__(self, index_path, commit_every=500):
+        self.index_path = index_path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._jsonl_path = None
+        self.conn = sqlite3.connect(index_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+            CREATE TABLE IF NOT EXISTS records (
+                offset INTEGER PRIMARY KEY,
+                readability_score REAL,
+                word_count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS postings (field TEXT, value TEXT, offset INTEGER);
+            CREATE INDEX IF NOT EXISTS postings_lookup ON postings (field, value, offset);
+            CREATE INDEX IF NOT EXISTS records_readability ON records (readability_score);
+        """)
+
+    @property
+    def indexed_bytes(self):
+        """Number of bytes of the JSONL file covered by the index"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'indexed_bytes'").fetchone()
+        return row[0] if row else 0
+
+    def _set_indexed_bytes(self, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('indexed_bytes', ?)", (value,)
+        )
+
+    @property
+    def fingerprint(self):
+        """file_fingerprint() of the JSONL file the index was built from"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        return row[0] if row else None
+
+    def _set_fingerprint(self, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (value,)
+        )
+
+    def _stale(self, jsonl_path, start, size):
+        """True if the indexed bytes do not belong to the current file"""
+        if start > size:
+            return True
+        if start == 0:
+            return False
+        if self.fingerprint != file_fingerprint(jsonl_path):
+            return True
+        # indexed bytes must end on a line boundary
+        with open(jsonl_path, "rb") as f:
+            f.seek(start - 1)
+            return f.read(1) != b"\n"
+
+    def clear(self):
+        """Drop all entries (used when the output file is overwritten)"""
+        self.conn.execute("DELETE FROM records")
+        self.conn.execute("DELETE FROM postings")
+        self._set_indexed_bytes(0)
+        self.conn.commit()
+
+    def add(self, record, offset, length):
+        """Index one record written at `offset` spanning `length` bytes"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records (offset, readability_score, word_count) VALUES (?, ?, ?)",
+            (offset, record.get("readability_score"), record.get("word_count")),
+        )
+        postings = []
+        for field in INDEXED_FIELDS:
+            values = record.get(field)
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            postings.extend((field, str(v).lower(), offset) for v in set(values))
+        self.conn.executemany("INSERT INTO postings (field, value, offset) VALUES (?, ?, ?)", postings)
+        self._set_indexed_bytes(offset + length)
+
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def sync(self, jsonl_path):
+        """
+        Bring the index up to date with the JSONL file by indexing any
+        bytes written since the last sync. The index is rebuilt from scratch
+        if the file shrank or was replaced or rewritten (fingerprint mismatch).
+        """
+        self._jsonl_path = jsonl_path
+        size = os.path.getsize(jsonl_path) if os.path.exists(jsonl_path) else 0
+        start = self.indexed_bytes
+        if self._stale(jsonl_path, start, size):
+            self.clear()
+            start = 0
+        if start == size:
+            self._set_fingerprint(file_fingerprint(jsonl_path))
+            self.commit()
+            return 0
+
+        added = 0
+        with open(jsonl_path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                try:
+                    self.add(json.loads(line), offset, len(line))
+                    added += 1
+                except json.JSONDecodeError:
+                    self._set_indexed_bytes(offset + len(line))  # skip malformed lines
+                offset += len(line)
+        self._set_fingerprint(file_fingerprint(jsonl_path))
+        self.commit()
+        return added
+
+    def query(self, min_readability=None, max_readability=None, limit=None, **terms):
+        """
+        Return byte offsets of records matching every given term.
+        terms: field=value or field=[values] for fields in INDEXED_FIELDS
+        (a list matches records having all of the values)
+        """
+        clauses, params = [], []
+        for field, values in terms.items():
+            if field not in INDEXED_FIELDS:
+                raise ValueError(f"Field '{field}' is not indexed (indexed: {', '.join(INDEXED_FIELDS)})")
+            if values is None:
+                continue
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            for value in values:
+                clauses.append("offset IN (SELECT offset FROM postings WHERE field = ? AND value = ?)")
+                params.extend([field, str(value).lower()])
+
+        if min_readability is not None:
+            clauses.append("readability_score >= ?")
+            params.append(min_readability)
+        if max_readability is not None:
+            clauses.append("readability_score <= ?")
+            params.append(max_readability)
+
+        sql = "SELECT offset FROM records"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def commit(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self):
+        # records added since sync() may have changed the first line (e.g. a new file)
+        if self._jsonl_path:
+            self._set_fingerprint(file_fingerprint(self._jsonl_path))
+        self.commit()
+        self.conn.close()
+
+
+def read_records(jsonl_path, offsets):
+    """Yield the JSON records stored at the given byte offsets"""
+    with open(jsonl_path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            yield json.loads(f.readline())
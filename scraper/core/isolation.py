@@ -0,0 +1,290 @@
+# scraper/core/isolation.py
+
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from scraper.core.logger import Logger
+from scraper.core.metrics import RunMetrics
+
+
+# Stages and metrics of the current worker process, set by _init_worker
+_worker = {}
+
+
+def default_dead_letter_path(output_path):
+    return output_path + ".dead.jsonl"
+
+
+class DeadLetterFile:
+    """
+    Append-only JSONL of pages that could not be processed, one line per
+    failure: url, stage, error, elapsed_ms and failed_at (UTC).
+    The file is only created once the first failure is recorded.
+    replace=True (replaying a file in place): failures go to a temporary file
+    that replaces the original only on close(), so an interrupted replay
+    leaves the original entries intact.
+    """
+
+    def __init__(self, path, replace=False):
+        self.path = path
+        self.replace = replace
+        self._write_path = path + ".tmp" if replace else path
+        self.file = None
+        self.count = 0
+
+    def record(self, url, stage, error, elapsed_ms=None):
+        if self.file is None:
+            self.file = open(self._write_path, "w" if self.replace else "a", encoding="utf-8")
+        entry = {
+            "url": url,
+            "stage": stage,
+            "error": str(error),
+            "elapsed_ms": round(elapsed_ms, 1) if elapsed_ms is not None else None,
+            "failed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.count += 1
+
+    @staticmethod
+    def load(path):
+        """Read the entries of a dead-letter file (malformed lines are skipped)"""
+        entries = []
+        if not os.path.exists(path):
+            return entries
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return entries
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.replace:
+            if self.count:
+                os.replace(self._write_path, self.path)
+            elif os.path.exists(self.path):
+                os.remove(self.path)
+            self.replace = False
+
+
+def _build_stages(config, metrics):
+    from scraper.core.parser import Parser
+    from scraper.core.enricher import Enricher
+    return Parser(config), Enricher(config, metrics=metrics)
+
+
+def _process_page(parser, enricher, url, html, known_hash=None):
+    """
+    Parse and enrich one page, reporting the failing stage instead of raising.
+    If the parsed content matches known_hash, enrichment is skipped and the
+    outcome is marked unchanged.
+    """
+    start = time.perf_counter()
+    stage = "parse"
+    try:
+        parsed = parser.parse(html, url)
+        if known_hash is not None and enricher.content_hash(parsed) == known_hash:
+            return {"url": url, "unchanged": True, "elapsed_ms": (time.perf_counter() - start) * 1000}
+        stage = "enrich"
+        record = enricher.enrich(parsed)
+        return {"url": url, "record": record, "elapsed_ms": (time.perf_counter() - start) * 1000}
+    except Exception as e:
+        return {
+            "url": url,
+            "stage": stage,
+            "error": f"{type(e).__name__}: {e}",
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+        }
+
+
+def _init_worker(config, log_options):
+    Logger.configure(**log_options)
+    metrics = RunMetrics()
+    _worker["metrics"] = metrics
+    _worker["parser"], _worker["enricher"] = _build_stages(config, metrics)
+
+
+def _run_job(url, html, known_hash=None):
+    outcome = _process_page(_worker["parser"], _worker["enricher"], url, html, known_hash)
+    # ship this job's metrics back to the parent and start afresh
+    metrics = _worker["metrics"]
+    outcome["metrics"] = metrics.as_dict()
+    metrics.counters.clear()
+    metrics.timings.clear()
+    metrics.gauges.clear()
+    return outcome
+
+
+class PageProcessor:
+    """
+    Runs parse + enrich for each page in a pool of worker processes, so a
+    crash or a pathological page (huge tables, regex-heavy bodies) cannot
+    stall or take down the pipeline.
+    - each page gets at most page_timeout seconds; on timeout the pool is
+      recycled and the page is skipped
+    - failed and timed-out pages go to the dead-letter file with their stage
+    - workers=0 processes pages in-process (failures are still isolated,
+      but timeouts cannot be enforced)
+    Results are yielded in completion order.
+    """
+
+    def __init__(self, config, workers=2, page_timeout=30.0, metrics=None, dead_letter=None):
+        self.config = config
+        self.workers = workers
+        self.page_timeout = page_timeout
+        self.metrics = metrics or RunMetrics()
+        self.dead_letter = dead_letter
+        self.logger = Logger(__name__).get()
+        self._pool = None
+        self._stages = None
+
+    @classmethod
+    def from_config(cls, config, metrics=None, dead_letter=None, workers=None, page_timeout=None):
+        """Read the "processing" config section; explicit arguments take precedence"""
+        cfg = config.get("processing", {})
+        return cls(
+            config,
+            workers=cfg.get("workers", 2) if workers is None else workers,
+            page_timeout=cfg.get("page_timeout", 30.0) if page_timeout is None else page_timeout,
+            metrics=metrics,
+            dead_letter=dead_letter,
+        )
+
+    def _start_pool(self):
+        self._pool = multiprocessing.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(self.config, Logger.worker_options()),
+        )
+
+    def _restart_pool(self):
+        """Kill workers stuck on timed-out pages and start a fresh pool"""
+        self._pool.terminate()
+        self._pool.join()
+        self.metrics.incr("worker_pool_restarts")
+        self._start_pool()
+
+    def _fail(self, url, stage, error, elapsed_ms):
+        self.logger.error(
+            f"Processing failed ({stage}) for {url}: {error}",
+            extra={"url": url, "stage": stage, "latency_ms": round(elapsed_ms, 1)},
+        )
+        self.metrics.incr("pages_timed_out" if stage == "timeout" else "pages_failed")
+        if self.dead_letter:
+            self.dead_letter.record(url, stage, error, elapsed_ms)
+
+    def _handle(self, outcome):
+        """
+        Fold in a job's metrics; return (url, record), (url, None) for
+        unchanged content, or None for a failure
+        """
+        if "metrics" in outcome:
+            self.metrics.merge(outcome["metrics"])
+        self.metrics.observe("page_process_ms", outcome["elapsed_ms"])
+        if "error" in outcome:
+            self._fail(outcome["url"], outcome["stage"], outcome["error"], outcome["elapsed_ms"])
+            return None
+        if outcome.get("unchanged"):
+            return outcome["url"], None
+        self.metrics.incr("pages_processed")
+        return outcome["url"], outcome["record"]
+
+    def _collect(self, url, job, submitted):
+        """Result of a finished job; errors raised in the worker itself become failures"""
+        try:
+            outcome = job.get()
+        except Exception as e:
+            outcome = {
+                "url": url,
+                "stage": "worker",
+                "error": f"{type(e).__name__}: {e}",
+                "elapsed_ms": (time.monotonic() - submitted) * 1000,
+            }
+        return self._handle(outcome)
+
+    def _timeout(self, url):
+        self._fail(url, "timeout", f"exceeded page timeout of {self.page_timeout}s", self.page_timeout * 1000)
+
+    def process(self, pages, known_hash=None):
+        """
+        Process an iterable of (url, html) pairs.
+        Yields (url, enriched_record) for every page that succeeded.
+        known_hash: optional callable url -> last content_hash; pages whose
+        parsed content still matches are not enriched and yield (url, None)
+        """
+        if self.workers <= 0:
+            if self._stages is None:
+                self._stages = _build_stages(self.config, self.metrics)
+            for url, html in pages:
+                last_hash = known_hash(url) if known_hash else None
+                result = self._handle(_process_page(*self._stages, url, html, last_hash))
+                if result:
+                    yield result
+            return
+
+        if self._pool is None:
+            self._start_pool()
+
+        pages = iter(pages)
+        # at most one in-flight page per worker, so a page starts as soon as it is submitted
+        pending = deque()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < self.workers:
+                page = next(pages, None)
+                if page is None:
+                    exhausted = True
+                    break
+                url, html = page
+                last_hash = known_hash(url) if known_hash else None
+                job = self._pool.apply_async(_run_job, (url, html, last_hash))
+                submitted = time.monotonic()
+                pending.append((url, job, submitted, submitted + self.page_timeout))
+            if not pending:
+                return
+
+            pending[0][1].wait(0.05)
+            now = time.monotonic()
+            stuck = False
+            for entry in list(pending):
+                url, job, submitted, deadline = entry
+                if job.ready():
+                    pending.remove(entry)
+                    result = self._collect(url, job, submitted)
+                    if result:
+                        yield result
+                elif now >= deadline:
+                    stuck = True
+
+            if stuck:
+                # give the other in-flight pages their full time, then recycle the pool
+                for url, job, submitted, deadline in pending:
+                    job.wait(max(0.0, deadline - time.monotonic()))
+                    if job.ready():
+                        result = self._collect(url, job, submitted)
+                        if result:
+                            yield result
+                    else:
+                        self._timeout(url)
+                pending.clear()
+                self._restart_pool()
+
+    def close(self, terminate=False):
+        """Wait for the workers to exit, or kill them (terminate=True, e.g. after an error)"""
+        if self._pool is not None:
+            if terminate:
+                self._pool.terminate()
+            else:
+                self._pool.close()
+            self._pool.join()
+            self._pool = None
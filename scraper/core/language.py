@@ -0,0 +1,133 @@
+# scraper/core/language.py
+
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+# Small stopword lists used to cheaply confirm a site's expected language
+STOPWORDS = {
+    "en": {"the", "and", "of", "to", "in", "is", "a", "that", "for", "it", "with", "as", "are",
+           "on", "be", "or", "by", "this", "your", "you", "can", "from", "have", "not"},
+    "es": {"el", "la", "de", "que", "y", "en", "los", "se", "del", "las", "por", "un", "una",
+           "para", "con", "no", "es", "su", "al", "lo", "como", "más", "pero"},
+    "fr": {"le", "la", "les", "de", "des", "et", "en", "un", "une", "du", "est", "que", "pour",
+           "dans", "qui", "pas", "sur", "au", "avec", "ce", "il", "sont", "vous"},
+    "de": {"der", "die", "das", "und", "in", "den", "von", "zu", "mit", "ist", "des", "sich",
+           "nicht", "auf", "für", "ein", "eine", "dem", "auch", "es", "an", "werden", "sie"},
+    "pt": {"de", "a", "o", "que", "e", "do", "da", "em", "um", "para", "com", "não", "uma",
+           "os", "no", "se", "na", "por", "mais", "as", "dos", "como", "mas"},
+    "it": {"di", "e", "il", "la", "che", "in", "un", "per", "non", "una", "del", "della", "con",
+           "sono", "gli", "le", "si", "da", "al", "come", "anche", "più", "ma"},
+}
+
+
+@lru_cache(maxsize=None)
+def _langdetect(seed):
+    """Import langdetect, load its profiles once and seed it for deterministic output"""
+    import langdetect
+    from langdetect import DetectorFactory, detector_factory
+    DetectorFactory.seed = seed
+    detector_factory.init_factory()
+    return langdetect
+
+
+class LanguageDetector:
+    """
+    Language detection with cheap short-circuit paths:
+    - texts shorter than min_chars return the default language
+    - results are cached per content_hash
+    - when the site config sets expected_language, a stopword check on the
+      sample confirms it without running the probabilistic detector
+    - otherwise langdetect runs (seeded) on a bounded prefix of the text
+    """
+
+    def __init__(self, expected_language=None, default="en", sample_chars=2000,
+                 min_chars=25, cache_size=10000, seed=0, metrics=None):
+        self.expected_language = expected_language
+        self.default = default
+        self.sample_chars = sample_chars
+        self.min_chars = min_chars
+        self.cache_size = cache_size
+        self.seed = seed
+        self.metrics = metrics
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config, metrics=None):
+        cfg = config.get("enrichment", {})
+        opts = cfg.get("language_detection", {})
+        return cls(
+            expected_language=cfg.get("expected_language"),
+            default=opts.get("default", cfg.get("expected_language") or "en"),
+            sample_chars=opts.get("sample_chars", 2000),
+            cache_size=opts.get("cache_size", 10000),
+            seed=opts.get("seed", 0),
+            metrics=metrics,
+        )
+
+    def _sample(self, text):
+        """Bounded prefix of the text, cut at a word boundary"""
+        if len(text) <= self.sample_chars:
+            return text
+        sample = text[:self.sample_chars]
+        cut = sample.rfind(" ")
+        return sample[:cut] if cut > 0 else sample
+
+    def _confirms_expected(self, sample):
+        """Check the expected language has the highest stopword ratio in the sample"""
+        expected = self.expected_language
+        if expected not in STOPWORDS:
+            return False
+
+        words = [w.lower() for w in _WORD.findall(sample[:1000])]
+        if len(words) < 5:
+            return False
+
+        def ratio(lang):
+            stopwords = STOPWORDS[lang]
+            return sum(w in stopwords for w in words) / len(words)
+
+        expected_ratio = ratio(expected)
+        return expected_ratio >= 0.1 and all(
+            expected_ratio >= ratio(lang) for lang in STOPWORDS if lang != expected
+        )
+
+    def _detect(self, text):
+        """Run the short-circuit paths, then fall back to langdetect"""
+        if len(text) <= self.min_chars:
+            return self.default, "short"
+
+        sample = self._sample(text)
+        if self.expected_language and self._confirms_expected(sample):
+            return self.expected_language, "expected"
+
+        langdetect = _langdetect(self.seed)
+        try:
+            return langdetect.detect(sample), "detected"
+        except langdetect.LangDetectException:
+            return self.default, "failed"
+
+    def detect(self, text, content_hash=None):
+        """Return an ISO language code for the text"""
+        text = text or ""
+        if content_hash is not None and content_hash in self._cache:
+            self._cache.move_to_end(content_hash)
+            if self.metrics:
+                self.metrics.incr("language_cache_hits")
+            return self._cache[content_hash]
+
+        start = time.perf_counter()
+        lang, path = self._detect(text)
+        if self.metrics:
+            self.metrics.observe("language_detect_ms", (time.perf_counter() - start) * 1000)
+            self.metrics.incr(f"language_{path}")
+
+        if content_hash is not None:
+            self._cache[content_hash] = lang
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return lang
@@ -1,56 +1,257 @@
 # scraper/core/logger.py
 
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
 
+# Structured fields picked up from `extra={...}` when emitting JSON lines
+STRUCTURED_FIELDS = ("url", "depth", "status", "latency_ms", "stage")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects.
+    Structured fields passed through `extra` are emitted as top-level keys.
+    """
+
+    def format(self, record):
+        payload = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            payload["suppressed"] = suppressed
+
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of high-volume debug records.
+    Records at INFO and above always pass.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class DuplicateFilter(logging.Filter):
+    """
+    Suppress repeated warnings/errors within a time window.
+    Records are grouped by `extra={"dedupe_key": ...}` when given,
+    otherwise by logger name, level and rendered message. The first record
+    emitted after a window closes reports how many were suppressed.
+    """
+
+    def __init__(self, window=0.0, max_keys=1024):
+        super().__init__()
+        self.window = window
+        self.max_keys = max_keys
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        """Drop keys whose window has expired to keep memory bounded"""
+        expired = [k for k, (first, _) in self._seen.items() if now - first >= self.window]
+        for key in expired:
+            del self._seen[key]
+
+    def filter(self, record):
+        if not self.window or record.levelno < logging.WARNING:
+            return True
+
+        key = getattr(record, "dedupe_key", None)
+        if key is None:
+            key = (record.name, record.levelno, record.getMessage())
+
+        now = time.monotonic()
+        with self._lock:
+            first, suppressed = self._seen.get(key, (None, 0))
+            if first is not None and now - first < self.window:
+                self._seen[key] = (first, suppressed + 1)
+                return False
+
+            if len(self._seen) >= self.max_keys:
+                self._prune(now)
+            self._seen[key] = (now, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+            record.msg = f"{record.msg} (suppressed {suppressed} similar messages)"
+        return True
+
+
 class Logger:
     """
     Central logging utility
+
+    By default every named logger writes synchronously to a rotating file and
+    the console. `Logger.configure(queue_mode=True)` switches all loggers to a
+    non-blocking QueueHandler drained by a single listener thread.
     """
 
+    _options = {
+        "queue_mode": False,
+        "json_format": False,
+        "debug_sample_rate": 1.0,
+        "dedupe_window": 0.0,
+        "level": logging.INFO,
+    }
+    _names = set()
+    _listener = None
+    _queue_handler = None
+    _filters = []
+
     def __init__(self, name=__name__, log_filename="scraper.log"):
         self.name = name
-
-        # Determine logs directory relative to project root
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        log_dir = os.path.join(project_root, "logs")
-        os.makedirs(log_dir, exist_ok=True)
-
-        self.log_path = os.path.join(log_dir, log_filename)
+        self.log_path = self._log_path(log_filename)
 
         self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(self._options["level"])
 
         if not self.logger.handlers:
             self._add_handlers()
+        Logger._names.add(self.name)
 
-    def _add_handlers(self):
-        """Internal helper to attach file + console handlers."""
+    @staticmethod
+    def _log_path(log_filename="scraper.log"):
+        """Determine logs directory relative to project root"""
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        log_dir = os.path.join(project_root, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        return os.path.join(log_dir, log_filename)
+
+    @classmethod
+    def _build_sinks(cls, log_path):
+        """Create the file + console handlers that actually do the I/O."""
 
         # Rotating file handler when file size grows to 5MB
         file_handler = RotatingFileHandler(
-            self.log_path,
+            log_path,
             maxBytes=5_000_000,
             backupCount=3
         )
         # set format of the log
-        file_handler.setFormatter(
-            logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-        )
-        file_handler.setLevel(logging.INFO)
+        if cls._options["json_format"]:
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_handler.setFormatter(
+                logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+            )
+        file_handler.setLevel(cls._options["level"])
 
-        # send logs to terminal 
+        # send logs to terminal
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(
             logging.Formatter("[%(levelname)s] %(message)s")
         )
-        console_handler.setLevel(logging.INFO)
+        console_handler.setLevel(max(cls._options["level"], logging.INFO))
+
+        return [file_handler, console_handler]
+
+    def _add_handlers(self):
+        """Internal helper to attach file + console handlers (or the shared queue handler)."""
+        for f in Logger._filters:
+            self.logger.addFilter(f)
+
+        if Logger._options["queue_mode"]:
+            self.logger.addHandler(Logger._get_queue_handler(self.log_path))
+            return
+
+        for handler in self._build_sinks(self.log_path):
+            self.logger.addHandler(handler)
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+    @classmethod
+    def _get_queue_handler(cls, log_path):
+        """Start the shared listener thread on first use and return its QueueHandler"""
+        if cls._queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            cls._listener = QueueListener(
+                log_queue, *cls._build_sinks(log_path), respect_handler_level=True
+            )
+            cls._listener.start()
+            cls._queue_handler = QueueHandler(log_queue)
+        return cls._queue_handler
+
+    @classmethod
+    def configure(cls, queue_mode=False, json_format=False, debug_sample_rate=1.0,
+                  dedupe_window=0.0, level=logging.INFO):
+        """
+        Reconfigure every logger created through this class.
+        queue_mode: route records through a QueueHandler + listener thread
+        json_format: write structured JSON lines to the log file
+        debug_sample_rate: fraction of DEBUG records to keep (0.0 - 1.0)
+        dedupe_window: seconds during which identical warnings/errors are suppressed
+        """
+        cls.shutdown()
+        cls._options = {
+            "queue_mode": queue_mode,
+            "json_format": json_format,
+            "debug_sample_rate": debug_sample_rate,
+            "dedupe_window": dedupe_window,
+            "level": level,
+        }
+        cls._filters = []
+        if debug_sample_rate < 1.0:
+            cls._filters.append(SamplingFilter(debug_sample_rate))
+        if dedupe_window:
+            cls._filters.append(DuplicateFilter(dedupe_window))
+
+        for name in cls._names:
+            instance = logging.getLogger(name)
+            for handler in list(instance.handlers):
+                instance.removeHandler(handler)
+                if handler is not cls._queue_handler:
+                    handler.close()
+            for f in list(instance.filters):
+                instance.removeFilter(f)
+            Logger(name)
+
+    @classmethod
+    def worker_options(cls):
+        """
+        configure() options for a worker process: same format and filters,
+        but synchronous, since the parent's listener thread does not exist there
+        """
+        return dict(cls._options, queue_mode=False)
+
+    @classmethod
+    def shutdown(cls):
+        """Flush and stop the queue listener thread, if running"""
+        if cls._listener is not None:
+            cls._listener.stop()
+            for handler in cls._listener.handlers:
+                handler.close()
+        cls._listener = None
+        cls._queue_handler = None
 
     def get(self):
         """Return the configured logger instance"""
-        return self.logger
\ No newline at end of file
+        return self.logger
+
+
+atexit.register(Logger.shutdown)
@@ -0,0 +1,75 @@
+# scraper/core/metrics.py
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class RunMetrics:
+    """
+    Counters, gauges and timing observations collected during a pipeline run.
+    Timings are kept as aggregates (count / total / max) so memory stays
+    constant regardless of how many pages are processed.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timings = {}
+        self.gauges = {}
+
+    def incr(self, name, value=1):
+        """Increment a counter"""
+        self.counters[name] += value
+
+    def observe(self, name, ms):
+        """Record one timing observation in milliseconds"""
+        stat = self.timings.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stat["count"] += 1
+        stat["total_ms"] += ms
+        stat["max_ms"] = max(stat["max_ms"], ms)
+
+    def gauge_max(self, name, value):
+        """Keep the highest value seen for a gauge (e.g. peak RSS)"""
+        self.gauges[name] = max(self.gauges.get(name, value), value)
+
+    @contextmanager
+    def timer(self, name):
+        """Time the enclosed block and record it under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def merge(self, other):
+        """Fold in metrics from another RunMetrics or its as_dict() output"""
+        if isinstance(other, RunMetrics):
+            other = other.as_dict()
+        self.counters.update(other.get("counters", {}))
+        for name, stat in other.get("timings", {}).items():
+            mine = self.timings.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            mine["count"] += stat["count"]
+            mine["total_ms"] += stat["total_ms"]
+            mine["max_ms"] = max(mine["max_ms"], stat["max_ms"])
+        for name, value in other.get("gauges", {}).items():
+            self.gauge_max(name, value)
+
+    def as_dict(self):
+        """Return a JSON-serializable snapshot"""
+        return {
+            "counters": dict(self.counters),
+            "timings": {name: dict(stat) for name, stat in self.timings.items()},
+            "gauges": dict(self.gauges),
+        }
+
+    def summary(self):
+        """Human-readable one-line-per-metric summary for the run log"""
+        lines = [f"{name}={value}" for name, value in sorted(self.counters.items())]
+        lines += [f"{name}={value}" for name, value in sorted(self.gauges.items())]
+        for name, stat in sorted(self.timings.items()):
+            mean = stat["total_ms"] / stat["count"] if stat["count"] else 0.0
+            lines.append(
+                f"{name}: count={stat['count']} mean={mean:.1f}ms "
+                f"max={stat['max_ms']:.1f}ms total={stat['total_ms']:.1f}ms"
+            )
+        return lines
@@ -3,9 +3,13 @@
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from scraper.core.cleaner import Cleaner
+from scraper.core.extraction import ExtractionPlan
 import re
 
 
+HEADING_TAG = re.compile(r"^h[1-6]$")
+
+
 class Parser:
     """
     Encapsulates all parsing utilities:
@@ -19,6 +23,8 @@ class Parser:
         self.config = config
         self.selectors = config.get("selectors", {})
         self.cleaner = Cleaner()
+        # selectors, extra fields and plugin are compiled once per site
+        self.plan = ExtractionPlan.from_config(config)
 
 
     def extract_links(self, html, base_url):
@@ -41,66 +47,63 @@ class Parser:
 
         return links
 
-    def _extract_title(self, soup):
-        """Extract title using selector or fallback to <title>"""
-        selector = self.selectors.get("title")
-
-        if selector:
-            el = soup.select_one(selector)
-            if el and el.get_text(strip=True):
-                return el.get_text(strip=True)
+    def _title_value(self, selected, page_title):
+        """Title from the selector match, falling back to <title>"""
+        if selected and selected.get_text(strip=True):
+            return selected.get_text(strip=True)
 
         # fallback: page <title>
-        if soup.title and soup.title.string:
-            return soup.title.string.strip()
+        if page_title and page_title.string:
+            return page_title.string.strip()
 
         return None
 
-    def _extract_description(self, soup):
-        """Extract description from meta tags or selector"""
-        selector = self.selectors.get("description")
-
-        if selector:
-            meta = soup.select_one(selector)
-            if meta and meta.get("content"):
-                return meta["content"].strip()
+    def _description_value(self, selected, meta_description):
+        """Description from the selector match, falling back to the generic meta description"""
+        if selected and selected.get("content"):
+            return selected["content"].strip()
 
         # fallback: generic meta description
-        generic = soup.find("meta", attrs={"name": "description"})
-        if generic and generic.get("content"):
-            return generic["content"].strip()
+        if meta_description and meta_description.get("content"):
+            return meta_description["content"].strip()
 
         return None
 
-    def _extract_main_content(self, soup):
+    def _extract_title(self, soup):
+        """Extract title using selector or fallback to <title>"""
+        selected = self.plan.title.select_one(soup) if self.plan.title else None
+        return self._title_value(selected, soup.title)
+
+    def _extract_description(self, soup):
+        """Extract description from meta tags or selector"""
+        selected = self.plan.description.select_one(soup) if self.plan.description else None
+        return self._description_value(selected, soup.find("meta", attrs={"name": "description"}))
+
+    def _extract_content_blocks(self, soup):
         """
-        Extract main text content using:
+        Collect (tag_name, text) blocks using:
         - content_containers (outer wrappers)
         - content_tags (inner tags)
+        falling back to all <p> tags
+        """
+        return self.plan.execute(soup).blocks
+
+    def _extract_main_content(self, soup, blocks=None):
         """
-        content_blocks = []
-
-        containers = self.selectors.get("content_containers", [])
-        tags = self.selectors.get("content_tags", ["p"])
-
-        # Extract from configured containers
-        for container_selector in containers:
-            for container in soup.select(container_selector):
-                for tag in container.find_all(tags):
-                    text = tag.get_text(" ", strip=True)
-                    if text:
-                        content_blocks.append(text)
-
-        # fallback: all <p> tags if nothing extracted
-        if not content_blocks:
-            for tag in soup.find_all("p"):
-                text = tag.get_text(" ", strip=True)
-                if text:
-                    content_blocks.append(text)
-
-        full_text = "\n".join(content_blocks)
+        Extract main text content: content blocks joined by newlines, then cleaned
+        """
+        if blocks is None:
+            blocks = self._extract_content_blocks(soup)
+        full_text = "\n".join(text for _, text in blocks)
         return self.cleaner.clean(full_text)
 
+    def _extract_headings(self, blocks):
+        """Cleaned text of heading blocks (h1-h6) in document order"""
+        return [
+            self.cleaner.clean(text) for name, text in blocks
+            if HEADING_TAG.match(name)
+        ]
+
     def parse(self, html, url):
         """
         Parse HTML page into JSON
@@ -109,13 +112,24 @@ class Parser:
             "title": "",
             "description": "",
             "body_text": "",
+            "headings": [],
+            ...configured "fields" and plugin output
         }
         """
         soup = BeautifulSoup(html, "html.parser")
+        found = self.plan.execute(soup)
 
-        return {
+        record = {
             "url": url,
-            "title": self._extract_title(soup),
-            "description": self._extract_description(soup),
-            "body_text": self._extract_main_content(soup),
-        }
\ No newline at end of file
+            "title": self._title_value(found.title, found.page_title),
+            "description": self._description_value(found.description, found.meta_description),
+            "body_text": self._extract_main_content(soup, found.blocks),
+            "headings": self._extract_headings(found.blocks),
+        }
+        for spec in self.plan.fields:
+            record[spec.name] = spec.value(found.fields[spec.name], self.cleaner.clean)
+
+        if self.plan.plugin:
+            record.update(self.plan.plugin(soup, record) or {})
+
+        return record
\ No newline at end of file
@@ -0,0 +1,146 @@
+# scraper/core/scheduler.py
+
+import math
+import sqlite3
+import time
+
+
+DAY = 86400
+
+
+def estimate_change_rate(visits, changes, observed_seconds):
+    """
+    Estimate how often a page changes (changes per second) from periodic
+    visits, using the bias-reduced estimator of Cho & Garcia-Molina:
+        rate = -ln((n - X + 0.5) / (n + 0.5)) / mean_interval
+    visits: number of revisit intervals observed (n)
+    changes: intervals in which the content hash changed (X)
+    """
+    if visits <= 0 or observed_seconds <= 0:
+        return None
+    mean_interval = observed_seconds / visits
+    return -math.log((visits - changes + 0.5) / (visits + 0.5)) / mean_interval
+
+
+class RecrawlScheduler:
+    """
+    Persistent per-URL fetch history used to revisit pages in proportion
+    to how often they change. State lives in a small SQLite file:
+    first/last fetch time, last content_hash, visit and change counts, and
+    the time the page is next due.
+    """
+
+    def __init__(self, state_path, min_interval=6 * 3600, max_interval=30 * DAY,
+                 initial_interval=DAY):
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.conn = sqlite3.connect(state_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                first_fetch REAL,
+                last_fetch REAL,
+                last_hash TEXT,
+                visits INTEGER DEFAULT 0,
+                changes INTEGER DEFAULT 0,
+                next_due REAL
+            );
+            CREATE INDEX IF NOT EXISTS pages_due ON pages (next_due);
+        """)
+
+    @classmethod
+    def from_config(cls, config, state_path):
+        cfg = config.get("recrawl", {})
+        return cls(
+            state_path,
+            min_interval=cfg.get("min_interval_hours", 6) * 3600,
+            max_interval=cfg.get("max_interval_days", 30) * DAY,
+            initial_interval=cfg.get("initial_interval_hours", 24) * 3600,
+        )
+
+    def count(self):
+        """Number of URLs with fetch history"""
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def known(self, url):
+        """True if the URL has fetch history"""
+        return self.conn.execute("SELECT 1 FROM pages WHERE url = ?", (url,)).fetchone() is not None
+
+    def last_hash(self, url):
+        """content_hash recorded at the last fetch, or None for unknown URLs"""
+        row = self.conn.execute("SELECT last_hash FROM pages WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def changed(self, url, content_hash):
+        """True if the content is new or differs from the last recorded fetch (does not record anything)"""
+        last = self.last_hash(url)
+        return last is None or last != content_hash
+
+    def forget(self, url):
+        """Drop a URL's history (e.g. the config now excludes it)"""
+        self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+        self.conn.commit()
+
+    def _next_interval(self, visits, changes, observed_seconds):
+        """Revisit interval: 1 / estimated change rate, clamped to [min, max]"""
+        rate = estimate_change_rate(visits, changes, observed_seconds)
+        if rate is None:
+            return self.initial_interval
+        if rate == 0:
+            # never seen a change: back off geometrically
+            interval = 2 * observed_seconds / visits
+        else:
+            interval = 1 / rate
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record(self, url, content_hash, fetched_at=None):
+        """
+        Record a successful fetch and schedule the next visit.
+        Returns True if the content is new or changed since the last fetch.
+        """
+        now = fetched_at if fetched_at is not None else time.time()
+        row = self.conn.execute(
+            "SELECT first_fetch, last_hash, visits, changes FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO pages (url, first_fetch, last_fetch, last_hash, next_due) VALUES (?, ?, ?, ?, ?)",
+                (url, now, now, content_hash, now + self.initial_interval),
+            )
+            self.conn.commit()
+            return True
+
+        first_fetch, last_hash, visits, changes = row
+        changed = content_hash != last_hash
+        visits += 1
+        changes += changed
+        next_due = now + self._next_interval(visits, changes, now - first_fetch)
+
+        self.conn.execute(
+            "UPDATE pages SET last_fetch = ?, last_hash = ?, visits = ?, changes = ?, next_due = ? WHERE url = ?",
+            (now, content_hash, visits, changes, next_due, url),
+        )
+        self.conn.commit()
+        return changed
+
+    def defer(self, url, now=None):
+        """Push back a URL whose fetch failed so it does not eat the next run's budget"""
+        now = now if now is not None else time.time()
+        self.conn.execute(
+            "UPDATE pages SET next_due = ? WHERE url = ?", (now + self.min_interval, url)
+        )
+        self.conn.commit()
+
+    def due(self, budget, now=None):
+        """URLs due for revisit, most overdue first, at most `budget` of them"""
+        now = now if now is not None else time.time()
+        rows = self.conn.execute(
+            "SELECT url FROM pages WHERE next_due <= ? ORDER BY next_due LIMIT ?", (now, budget)
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,254 @@
+# scraper/core/spill.py
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections import deque
+
+from scraper.core.logger import Logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Spill once RSS reaches this fraction of the budget, leaving headroom
+SPILL_FRACTION = 0.8
+# Structures re-check the budget every N insertions
+CHECK_EVERY = 1000
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where it cannot be measured"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mb():
+    """Current resident set size of this process in MB, or None where it cannot be measured"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # no /proc (e.g. macOS): the peak is the best available bound
+        return peak_rss_mb()
+
+
+class _Spillable:
+    """
+    Shared bookkeeping: in memory until spill() moves contents to SQLite.
+    Spilled structures keep a running length so len()/bool() never scan the table.
+    """
+
+    def __init__(self, budget, table):
+        self.budget = budget
+        self.table = table
+        self.spilled = False
+        self._ops = 0
+        self._length = 0
+
+    def __len__(self):
+        return len(self._items) if not self.spilled else self._length
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def conn(self):
+        return self.budget.conn
+
+    def _tick(self):
+        self._ops += 1
+        if self._ops % CHECK_EVERY == 0:
+            self.budget.enforce()
+
+
+class SpillableSet(_Spillable):
+    """Set of strings that moves to an indexed SQLite table when spilled"""
+
+    def __init__(self, budget, table):
+        super().__init__(budget, table)
+        self._items = set()
+
+    def spill(self):
+        if self.spilled:
+            return
+        self.conn.execute(f"CREATE TABLE {self.table} (item TEXT PRIMARY KEY)")
+        self.conn.executemany(f"INSERT OR IGNORE INTO {self.table} VALUES (?)", ((i,) for i in self._items))
+        self._length = len(self._items)
+        self._items = set()
+        self.spilled = True
+
+    def add(self, item):
+        if self.spilled:
+            cursor = self.conn.execute(f"INSERT OR IGNORE INTO {self.table} VALUES (?)", (item,))
+            self._length += cursor.rowcount
+        else:
+            self._items.add(item)
+        self._tick()
+
+    def __contains__(self, item):
+        if not self.spilled:
+            return item in self._items
+        return self.conn.execute(f"SELECT 1 FROM {self.table} WHERE item = ?", (item,)).fetchone() is not None
+
+
+class SpillableQueue(_Spillable):
+    """FIFO queue of (url, depth) pairs backed by deque, then SQLite"""
+
+    def __init__(self, budget, table, items=()):
+        super().__init__(budget, table)
+        self._items = deque(items)
+
+    def spill(self):
+        if self.spilled:
+            return
+        self.conn.execute(f"CREATE TABLE {self.table} (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, depth INTEGER)")
+        self.conn.executemany(f"INSERT INTO {self.table} (url, depth) VALUES (?, ?)", self._items)
+        self._length = len(self._items)
+        self._items = deque()
+        self.spilled = True
+
+    def append(self, item):
+        if self.spilled:
+            self.conn.execute(f"INSERT INTO {self.table} (url, depth) VALUES (?, ?)", item)
+            self._length += 1
+        else:
+            self._items.append(item)
+        self._tick()
+
+    def popleft(self):
+        if not self.spilled:
+            return self._items.popleft()
+        row = self.conn.execute(f"SELECT id, url, depth FROM {self.table} ORDER BY id LIMIT 1").fetchone()
+        if row is None:
+            raise IndexError("pop from an empty queue")
+        self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (row[0],))
+        self._length -= 1
+        return row[1], row[2]
+
+
+class SpillableDict(_Spillable):
+    """Insertion-ordered {str: str} mapping (e.g. url -> html) backed by dict, then SQLite"""
+
+    def __init__(self, budget, table):
+        super().__init__(budget, table)
+        self._items = {}
+
+    def spill(self):
+        if self.spilled:
+            return
+        self.conn.execute(f"CREATE TABLE {self.table} (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT UNIQUE, value TEXT)")
+        self.conn.executemany(f"INSERT INTO {self.table} (key, value) VALUES (?, ?)", self._items.items())
+        self._length = len(self._items)
+        self._items = {}
+        self.spilled = True
+
+    def __setitem__(self, key, value):
+        if self.spilled:
+            if key not in self:
+                self._length += 1
+            self.conn.execute(
+                f"INSERT INTO {self.table} (key, value) VALUES (?, ?) "
+                f"ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+        else:
+            self._items[key] = value
+        self._tick()
+
+    def __getitem__(self, key):
+        if not self.spilled:
+            return self._items[key]
+        row = self.conn.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def __contains__(self, key):
+        if not self.spilled:
+            return key in self._items
+        return self.conn.execute(f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)).fetchone() is not None
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        if not self.spilled:
+            return iter(list(self._items.items()))
+        # separate cursor so iteration survives writes on the shared connection
+        return iter(self.conn.cursor().execute(f"SELECT key, value FROM {self.table} ORDER BY id"))
+
+
+class MemoryBudget:
+    """
+    Global memory budget for a run. Crawl-state structures created through
+    it live in memory until RSS reaches SPILL_FRACTION of the budget, then
+    all of them move to a temporary SQLite file on disk.
+    """
+
+    def __init__(self, max_mb, metrics=None, directory=None):
+        self.max_mb = max_mb
+        self.metrics = metrics
+        self.logger = Logger(__name__).get()
+        self._dir = tempfile.mkdtemp(prefix="scraper-spill-", dir=directory)
+        self.conn = sqlite3.connect(os.path.join(self._dir, "spill.sqlite"))
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self._structures = []
+        self.spilled = False
+        if rss_mb() is None:
+            self.logger.warning("RSS cannot be measured on this platform; the memory budget will not trigger spilling")
+
+    def _table(self, name):
+        """Unique table name, so a structure name can be reused (e.g. one frontier per crawl)"""
+        return f"{name}_{len(self._structures)}"
+
+    def set(self, name):
+        return self._register(SpillableSet(self, self._table(name)))
+
+    def queue(self, name, items=()):
+        return self._register(SpillableQueue(self, self._table(name), items))
+
+    def dict(self, name):
+        return self._register(SpillableDict(self, self._table(name)))
+
+    def _register(self, structure):
+        if self.spilled:
+            structure.spill()
+        self._structures.append(structure)
+        return structure
+
+    def enforce(self):
+        """Record RSS and spill every structure once the threshold is crossed"""
+        rss = rss_mb()
+        if rss is None:
+            return False
+        if self.metrics:
+            self.metrics.gauge_max("rss_peak_mb", round(rss, 1))
+        if self.spilled or rss < self.max_mb * SPILL_FRACTION:
+            return False
+
+        self.logger.warning(f"RSS {rss:.0f} MB reached {SPILL_FRACTION:.0%} of the {self.max_mb} MB budget; spilling crawl state to disk")
+        for structure in self._structures:
+            structure.spill()
+        self.conn.commit()
+        self.spilled = True
+        if self.metrics:
+            self.metrics.incr("memory_spills")
+        return True
+
+    def close(self):
+        """Remove the spill file"""
+        self.conn.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
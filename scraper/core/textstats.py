@@ -0,0 +1,119 @@
+# scraper/core/textstats.py
+
+import re
+from collections import Counter
+
+
+_WORD = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"[.!?]+")
+QUESTION_PREFIX = re.compile(r"^(what|why|how|when|where|who|which|can|does|do)\b", re.IGNORECASE)
+
+
+class TextStats:
+    """
+    Text statistics gathered in a single pass over the lines of a body text:
+    word counts and lengths, sentence count, paragraph fingerprints and
+    question lines. Used by the Enricher instead of re-scanning the text
+    once per metric.
+    """
+
+    __slots__ = (
+        "tokens", "words", "word_len_sum", "sentences",
+        "paragraphs", "paragraph_counts", "questions",
+    )
+
+    def __init__(self, text):
+        self.tokens = 0          # whitespace-separated tokens (word_count)
+        self.words = 0           # \w+ runs (readability)
+        self.word_len_sum = 0
+        self.sentences = 0
+        self.paragraphs = 0
+        self.paragraph_counts = Counter()
+        self.questions = []
+
+        # a sentence may continue across a newline, so track whether the
+        # currently open sentence has any non-space content
+        open_sentence = False
+
+        for line in (text or "").split("\n"):
+            self.tokens += len(line.split())
+
+            words = _WORD.findall(line)
+            self.words += len(words)
+            self.word_len_sum += sum(map(len, words))
+
+            for i, part in enumerate(_SENTENCE_END.split(line)):
+                if i:
+                    self.sentences += open_sentence
+                    open_sentence = False
+                if not open_sentence and part.strip():
+                    open_sentence = True
+
+            stripped = line.strip()
+            if stripped:
+                self.paragraphs += 1
+                self.paragraph_counts[stripped] += 1
+                if stripped.endswith("?") and QUESTION_PREFIX.match(stripped):
+                    self.questions.append(stripped)
+
+        self.sentences += open_sentence
+
+    @property
+    def sentence_count(self):
+        """Approximate sentence count (at least 1)"""
+        return max(1, self.sentences)
+
+    @property
+    def redundancy(self):
+        """Fraction of paragraphs that repeat an earlier paragraph"""
+        if not self.paragraphs:
+            return 0.0
+        return (self.paragraphs - len(self.paragraph_counts)) / self.paragraphs
+
+    @property
+    def readability(self):
+        """
+        Readability heuristic using:
+        avg sentence length, avg word length, redundancy penalty
+        Lower score = easier to read, higher score = more complex
+        """
+        if not self.words:
+            return 0.0
+
+        avg_word_len = self.word_len_sum / self.words
+        avg_sent_len = self.words / self.sentence_count
+
+        score = (
+            0.4 * avg_sent_len +
+            0.4 * avg_word_len +
+            0.2 * self.redundancy
+        )
+
+        return round(score, 3)
+
+
+def batch_readability(stats):
+    """
+    Compute readability scores for many TextStats at once with NumPy.
+    Returns the same values as TextStats.readability, in input order.
+    """
+    import numpy as np
+
+    if not stats:
+        return []
+
+    words = np.array([s.words for s in stats], dtype=np.float64)
+    word_len_sum = np.array([s.word_len_sum for s in stats], dtype=np.float64)
+    sentences = np.array([s.sentence_count for s in stats], dtype=np.float64)
+    paragraphs = np.array([s.paragraphs for s in stats], dtype=np.float64)
+    distinct = np.array([len(s.paragraph_counts) for s in stats], dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_word_len = word_len_sum / words
+        avg_sent_len = words / sentences
+        penalty = np.where(paragraphs > 0, (paragraphs - distinct) / paragraphs, 0.0)
+        scores = 0.4 * avg_sent_len + 0.4 * avg_word_len + 0.2 * penalty
+
+    scores = np.where(words > 0, scores, 0.0)
+    # Python's round() (not np.round) so results match TextStats.readability exactly
+    return [round(float(score), 3) for score in scores]
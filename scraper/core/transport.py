@@ -0,0 +1,196 @@
+# scraper/core/transport.py
+
+import time
+import importlib.util
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from scraper.core.logger import Logger
+
+
+USER_AGENT = "multi-site-scraper/1.0 (+https://github.com/shriyaRam/multi-site-scraper)"
+
+# Content codings and the optional module that lets us decode them
+_ENCODING_MODULES = {"br": ("brotli", "brotlicffi"), "zstd": ("zstandard",)}
+
+logger = Logger(__name__).get()
+
+
+def _accept_encoding(encodings):
+    """Only advertise codings the client can actually decode"""
+    supported = []
+    for encoding in encodings:
+        modules = _ENCODING_MODULES.get(encoding)
+        if modules and not any(importlib.util.find_spec(m) for m in modules):
+            continue
+        supported.append(encoding)
+    return ", ".join(supported)
+
+
+def _instrumented_pool(pool_cls, adapter):
+    """
+    Pool class whose connections report new connections, TCP connect
+    time and (for HTTPS) TLS handshake time to the adapter's metrics
+    """
+    is_https = pool_cls is HTTPSConnectionPool
+
+    class Connection(pool_cls.ConnectionCls):
+        def _new_conn(self):
+            start = time.perf_counter()
+            sock = super()._new_conn()
+            self._tcp_connect_ms = (time.perf_counter() - start) * 1000
+            return sock
+
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            total_ms = (time.perf_counter() - start) * 1000
+            tcp_ms = getattr(self, "_tcp_connect_ms", total_ms)
+
+            adapter.connections_opened += 1
+            adapter.metrics.incr("http_connections_new")
+            adapter.metrics.observe("http_tcp_connect_ms", tcp_ms)
+            if is_https:
+                adapter.metrics.observe("http_tls_handshake_ms", total_ms - tcp_ms)
+
+    class Pool(pool_cls):
+        ConnectionCls = Connection
+
+    return Pool
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records connection reuse and handshake timings.
+    A request is counted as reused when it completes without the pool
+    opening a new connection.
+    """
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        self.connections_opened = 0
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool(HTTPConnectionPool, self),
+            "https": _instrumented_pool(HTTPSConnectionPool, self),
+        }
+
+    def send(self, request, **kwargs):
+        opened = self.connections_opened
+        resp = super().send(request, **kwargs)
+        self.metrics.incr("http_requests")
+        if self.connections_opened == opened:
+            self.metrics.incr("http_connections_reused")
+        return resp
+
+
+class _Http2Response:
+    """Expose the small part of the requests.Response API the crawler uses"""
+
+    def __init__(self, resp, elapsed):
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.headers = resp.headers
+        self.ok = resp.is_success
+        self.elapsed = elapsed
+        self.http_version = resp.http_version
+
+    def raise_for_status(self):
+        self._resp.raise_for_status()
+
+    def iter_content(self, chunk_size=None):
+        return self._resp.iter_bytes(chunk_size)
+
+    def close(self):
+        self._resp.close()
+
+
+class Http2Session:
+    """
+    Minimal requests.Session-like wrapper over an httpx client with HTTP/2
+    enabled. Requires the optional `httpx[http2]` dependency.
+    """
+
+    def __init__(self, pool_maxsize, keep_alive, metrics):
+        import httpx
+
+        self.metrics = metrics
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize if keep_alive else 0,
+            ),
+        )
+        self.headers = self.client.headers
+
+    def _send(self, method, url, timeout, allow_redirects, stream):
+        from datetime import timedelta
+
+        request = self.client.build_request(method, url, timeout=timeout)
+        start = time.perf_counter()
+        resp = self.client.send(request, stream=stream, follow_redirects=allow_redirects)
+        elapsed = timedelta(seconds=time.perf_counter() - start)
+        self.metrics.incr("http_requests")
+        self.metrics.incr(f"http_version_{resp.http_version}")
+        return _Http2Response(resp, elapsed)
+
+    def get(self, url, timeout=None, stream=False, allow_redirects=True):
+        return self._send("GET", url, timeout, allow_redirects, stream)
+
+    def head(self, url, timeout=None, allow_redirects=False):
+        return self._send("HEAD", url, timeout, allow_redirects, stream=False)
+
+    def close(self):
+        self.client.close()
+
+
+def build_session(config, metrics):
+    """
+    Build the HTTP session for a site from its "transport" config:
+    pool_connections / pool_maxsize: connection pools per host and connections per pool
+    keep_alive: reuse connections between requests (default true)
+    accept_encoding: content codings to advertise (br/zstd only if decodable)
+    http2: use an HTTP/2 client (needs httpx[http2]; falls back to requests)
+    retries: transport-level retries on connection errors and 429/5xx
+    """
+    cfg = config.get("transport", {})
+    pool_connections = cfg.get("pool_connections", 10)
+    pool_maxsize = cfg.get("pool_maxsize", 10)
+    keep_alive = cfg.get("keep_alive", True)
+    accept_encoding = _accept_encoding(cfg.get("accept_encoding", ["gzip", "deflate", "br"]))
+
+    session = None
+    if cfg.get("http2"):
+        if importlib.util.find_spec("httpx") and importlib.util.find_spec("h2"):
+            session = Http2Session(pool_maxsize, keep_alive, metrics)
+        else:
+            logger.warning("HTTP/2 requested but httpx[http2] is not installed; using requests")
+
+    if session is None:
+        session = requests.Session()
+        adapter = InstrumentedAdapter(
+            metrics,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=cfg.get("retries", 0),
+                backoff_factor=cfg.get("backoff_factor", 0.5),
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": accept_encoding})
+    return session
@@ -0,0 +1,107 @@
+# scraper/core/url_filter.py
+
+import fnmatch
+import re
+from urllib.parse import urlparse
+
+
+_TERMINAL = "$"
+
+
+def _build_host_trie(domains):
+    """
+    Build a trie keyed on reversed host labels, e.g. medlineplus.gov ->
+    {"gov": {"medlineplus": {"$": True}}}
+    """
+    trie = {}
+    for domain in domains:
+        node = trie
+        for label in reversed(domain.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        node[_TERMINAL] = True
+    return trie
+
+
+def _compile_pattern(pattern):
+    """
+    Translate a substring or glob config pattern into a regex fragment:
+    - "glob:<glob>" -> shell-style glob matched against the whole URL
+    - anything else -> plain substring
+    """
+    if pattern.startswith("glob:"):
+        return rf"\A(?:{fnmatch.translate(pattern[5:])})"
+    return re.escape(pattern)
+
+
+def compile_patterns(patterns, setting="patterns"):
+    """
+    Compile config patterns into a list of regexes. Substrings and globs are
+    combined into one alternation so each URL is scanned once; "re:<regex>"
+    patterns are compiled on their own so inline flags and backreferences
+    keep their meaning. setting names the config entry in error messages.
+    """
+    if not patterns:
+        return None
+    compiled = []
+    literals = [_compile_pattern(p) for p in patterns if not p.startswith("re:")]
+    if literals:
+        compiled.append(re.compile("|".join(literals)))
+    for pattern in patterns:
+        if pattern.startswith("re:"):
+            try:
+                compiled.append(re.compile(pattern[3:]))
+            except re.error as e:
+                raise ValueError(f"Invalid regex in crawl.{setting}: {pattern!r} ({e})") from e
+    return compiled
+
+
+class UrlFilter:
+    """
+    URL filter compiled once from the site config:
+    - allowed_domains: exact host or any subdomain of it (suffix match on labels)
+    - exclude_patterns: URL is rejected if any pattern matches
+    - include_patterns: URL must match at least one pattern ("" matches everything)
+    """
+
+    def __init__(self, allowed_domains, exclude_patterns=None, include_patterns=None):
+        self._hosts = _build_host_trie(allowed_domains)
+        self._exclude = compile_patterns(exclude_patterns, "exclude_patterns")
+
+        include_patterns = include_patterns or []
+        # an empty pattern matches every URL, so there is nothing to restrict
+        if "" in include_patterns:
+            include_patterns = []
+        self._include = compile_patterns(include_patterns, "include_patterns")
+
+    @classmethod
+    def from_config(cls, config):
+        crawl = config.get("crawl", {})
+        return cls(
+            config["allowed_domains"],
+            exclude_patterns=crawl.get("exclude_patterns", []),
+            include_patterns=crawl.get("include_patterns", [""]),
+        )
+
+    def allowed_host(self, hostname):
+        """Check hostname against the allowed-domain trie"""
+        node = self._hosts
+        for label in reversed((hostname or "").lower().rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _TERMINAL in node:
+                return True
+        return False
+
+    def allowed_domain(self, url):
+        return self.allowed_host(urlparse(url).hostname)
+
+    def excluded(self, url):
+        return self._exclude is not None and any(p.search(url) for p in self._exclude)
+
+    def included(self, url):
+        return self._include is None or any(p.search(url) for p in self._include)
+
+    def allows(self, url):
+        """Return True if the URL passes domain, exclude and include checks"""
+        return self.allowed_domain(url) and not self.excluded(url) and self.included(url)
@@ -2,18 +2,22 @@
 
 import json
 import os
+from scraper.core.index import OutputIndex
 
 class JSONLWriter:
     """
     JSONL writer that supports idempotent append or full overwrite
     Deduplicates documents using a content hash
+    Optionally maintains an on-disk inverted index (index_path) of record offsets
+    seen_hashes: set-like store for the hashes (e.g. a disk-spillable set); defaults to set()
     """
 
-    def __init__(self, output_path, overwrite=False, hash_key="content_hash"):
+    def __init__(self, output_path, overwrite=False, hash_key="content_hash", index_path=None,
+                 seen_hashes=None):
         self.output_path = output_path
         self.overwrite = overwrite
         self.hash_key = hash_key
-        self._seen_hashes = set()
+        self._seen_hashes = seen_hashes if seen_hashes is not None else set()
 
         # If overwrite requested → delete old file
         if self.overwrite and os.path.exists(self.output_path):
@@ -23,9 +27,16 @@ class JSONLWriter:
         if not self.overwrite:
             self._load_existing_hashes()
 
-        # Open file correctly
+        # Open file correctly (newline="" so byte offsets match what is written)
         mode = "w" if self.overwrite else "a"
-        self.file = open(self.output_path, mode, encoding="utf-8")
+        self.file = open(self.output_path, mode, encoding="utf-8", newline="")
+        self._offset = os.path.getsize(self.output_path)
+
+        # Catch the index up with anything already in the file
+        self.index = None
+        if index_path:
+            self.index = OutputIndex(index_path)
+            self.index.sync(self.output_path)
 
     def _load_existing_hashes(self):
         """Load hash values from existing JSONL file to ensure idempotency."""
@@ -46,6 +57,7 @@ class JSONLWriter:
         """
         Write a single JSON object to the JSONL file if its hash is new.
         Ensures idempotency during append operations.
+        Returns True if the record was written, False if it was a duplicate.
         """
         record_hash = record.get(self.hash_key)
         if not record_hash:
@@ -53,13 +65,92 @@ class JSONLWriter:
 
         # Skip previously written content
         if record_hash in self._seen_hashes:
-            return
+            return False
 
         # Write new entry
-        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        self.file.write(line)
         self._seen_hashes.add(record_hash)
 
+        length = len(line.encode("utf-8"))
+        if self.index:
+            self.index.add(record, self._offset, length)
+        self._offset += length
+        return True
+
     def close(self):
-        """Close the file handle."""
+        """Close the file handle (and the index, if any)."""
         if hasattr(self, "file") and not self.file.closed:
-            self.file.close()
\ No newline at end of file
+            self.file.close()
+        if getattr(self, "index", None):
+            self.index.close()
+            self.index = None
+
+
+class ParquetWriter:
+    """
+    Streaming Parquet writer with the same hash-based deduplication as JSONLWriter.
+    Rows are buffered and flushed as row groups. Parquet files cannot be
+    appended to, so existing rows are copied into a temporary file first and
+    the result replaces the original on close.
+    Requires the optional `pyarrow` dependency.
+    """
+
+    def __init__(self, output_path, schema, hash_key="content_hash", batch_size=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from e
+
+        self._pa = pa
+        self.output_path = output_path
+        self.hash_key = hash_key
+        self.batch_size = batch_size
+        self.schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in schema])
+        self._seen_hashes = set()
+        self._buffer = []
+
+        self._tmp_path = output_path + ".tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, self.schema)
+
+        # Carry over existing rows (and their hashes) from a previous run
+        if os.path.exists(self.output_path):
+            existing = pq.ParquetFile(self.output_path)
+            for i in range(existing.num_row_groups):
+                table = existing.read_row_group(i).cast(self.schema)
+                self._seen_hashes.update(table.column(self.hash_key).to_pylist())
+                self._writer.write_table(table)
+
+    def _flush(self):
+        if self._buffer:
+            table = self._pa.Table.from_pylist(self._buffer, schema=self.schema)
+            self._writer.write_table(table)
+            self._buffer = []
+
+    def write(self, record):
+        """
+        Buffer a record if its hash is new.
+        Returns True if the record was written, False if it was a duplicate.
+        """
+        record_hash = record.get(self.hash_key)
+        if not record_hash:
+            raise ValueError(f"Record missing required key: '{self.hash_key}'")
+
+        if record_hash in self._seen_hashes:
+            return False
+
+        self._buffer.append(record)
+        self._seen_hashes.add(record_hash)
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+        return True
+
+    def close(self):
+        """Flush remaining rows and move the file into place."""
+        if self._writer is None:
+            return
+        self._flush()
+        self._writer.close()
+        self._writer = None
+        os.replace(self._tmp_path, self.output_path)
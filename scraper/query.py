@@ -0,0 +1,83 @@
+# scraper/query.py
+"""
+Query scraped JSONL output through its inverted index.
+
+Examples:
+    python -m scraper.query --output output/medlineplus.jsonl --keyword asthma
+    python -m scraper.query --output output/medlineplus.jsonl --language en --min-readability 10 --fields url,title
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from scraper.core.index import OutputIndex, default_index_path, read_records
+
+
+def run_query(output_path, index_path=None, keywords=None, language=None, text_length=None,
+              source_domain=None, min_readability=None, max_readability=None, limit=None):
+    """Sync the index with the output file and return matching records"""
+    if not os.path.exists(output_path):
+        raise FileNotFoundError(f"Output file not found: {output_path}")
+
+    index = OutputIndex(index_path or default_index_path(output_path))
+    try:
+        index.sync(output_path)
+        offsets = index.query(
+            keywords=keywords,
+            language=language,
+            text_length=text_length,
+            source_domain=source_domain,
+            min_readability=min_readability,
+            max_readability=max_readability,
+            limit=limit,
+        )
+    finally:
+        index.close()
+
+    return read_records(output_path, offsets)
+
+
+def cli(argv=None):
+    arg_parser = argparse.ArgumentParser(
+        description="Query scraped JSONL output using its inverted index"
+    )
+    arg_parser.add_argument("--output", required=True, help="JSONL output file (e.g., output/medlineplus.jsonl)")
+    arg_parser.add_argument("--index", default=None, help="Index file (default: <output>.idx)")
+    arg_parser.add_argument("--keyword", action="append", help="Keyword the page must have (repeatable)")
+    arg_parser.add_argument("--language", help="Language code, e.g. en")
+    arg_parser.add_argument("--text-length", choices=["short", "medium", "long", "very_long"])
+    arg_parser.add_argument("--domain", help="Source domain, e.g. medlineplus.gov")
+    arg_parser.add_argument("--min-readability", type=float)
+    arg_parser.add_argument("--max-readability", type=float)
+    arg_parser.add_argument("--limit", type=int)
+    arg_parser.add_argument("--fields", help="Comma-separated fields to print (default: whole record)")
+    arg_parser.add_argument("--count", action="store_true", help="Only print the number of matches")
+
+    args = arg_parser.parse_args(argv)
+    records = run_query(
+        args.output,
+        index_path=args.index,
+        keywords=args.keyword,
+        language=args.language,
+        text_length=args.text_length,
+        source_domain=args.domain,
+        min_readability=args.min_readability,
+        max_readability=args.max_readability,
+        limit=args.limit,
+    )
+
+    if args.count:
+        print(sum(1 for _ in records))
+        return
+
+    fields = args.fields.split(",") if args.fields else None
+    for record in records:
+        if fields:
+            record = {f: record.get(f) for f in fields}
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,15 @@
+import pytest
+from scraper.core.logger import Logger
+
+
+@pytest.fixture(autouse=True)
+def tmp_logs(monkeypatch, tmp_path):
+    """Send every logger to a per-test directory instead of the tracked logs/scraper.log"""
+    monkeypatch.setattr(
+        Logger, "_log_path",
+        staticmethod(lambda log_filename="scraper.log": str(tmp_path / log_filename))
+    )
+    # re-attach handlers of loggers created before the patch (e.g. at module import)
+    Logger.configure()
+    yield tmp_path
+    Logger.configure()
@@ -0,0 +1,117 @@
+import pytest
+from scraper.core.chunker import Chunker, CHUNK_SCHEMA
+from scraper.core.writer import JSONLWriter
+
+
+@pytest.fixture
+def record():
+    return {
+        "url": "https://example.com/asthma",
+        "content_hash": "abc",
+        "headings": ["Causes", "Treatment"],
+        "body_text": (
+            "Asthma is a chronic lung disease.\n"
+            "It inflames and narrows the airways.\n"
+            "Causes\n"
+            "Allergens can trigger asthma.\n"
+            "Smoke and pollution also trigger it.\n"
+            "Treatment\n"
+            "Inhalers help control symptoms."
+        ),
+    }
+
+
+def test_headings_start_new_chunks(record):
+    chunks = list(Chunker(size=50, overlap=0).chunk(record))
+
+    assert [c["heading"] for c in chunks] == [None, "Causes", "Treatment"]
+    assert chunks[1]["text"].startswith("Causes\nAllergens")
+    assert [c["chunk_index"] for c in chunks] == [0, 1, 2]
+    assert all(c["content_hash"] == "abc" for c in chunks)
+
+
+def test_window_respects_block_boundaries(record):
+    record["headings"] = []
+    chunks = list(Chunker(size=12, overlap=0).chunk(record))
+
+    lines = set(record["body_text"].split("\n"))
+    for chunk in chunks:
+        assert all(line in lines for line in chunk["text"].split("\n"))
+        assert chunk["token_count"] <= 12
+
+
+def test_overlap_carries_trailing_blocks(record):
+    record["headings"] = []
+    chunks = list(Chunker(size=12, overlap=6).chunk(record))
+
+    first_last_line = chunks[0]["text"].split("\n")[-1]
+    assert chunks[1]["text"].startswith(first_last_line)
+
+
+def test_oversized_block_is_windowed():
+    record = {"url": "u", "body_text": " ".join(str(i) for i in range(25))}
+    chunks = list(Chunker(size=10, overlap=2).chunk(record))
+
+    assert all(c["token_count"] <= 10 for c in chunks)
+    assert chunks[0]["text"].split()[-2:] == chunks[1]["text"].split()[:2]
+    assert chunks[-1]["text"].split()[-1] == "24"
+
+
+def test_char_unit():
+    record = {"url": "u", "body_text": "abcdefghij" * 3}
+    chunks = list(Chunker(size=10, overlap=0, unit="chars").chunk(record))
+
+    assert [c["text"] for c in chunks] == ["abcdefghij"] * 3
+
+
+def test_chunk_hash_is_stable_and_url_scoped(record):
+    a = list(Chunker().chunk(record))
+    b = list(Chunker().chunk(record))
+    other = list(Chunker().chunk({**record, "url": "https://example.com/other"}))
+
+    assert [c["chunk_hash"] for c in a] == [c["chunk_hash"] for c in b]
+    assert a[0]["chunk_hash"] != other[0]["chunk_hash"]
+
+
+def test_invalid_config():
+    with pytest.raises(ValueError):
+        Chunker(size=10, overlap=10)
+    with pytest.raises(ValueError):
+        Chunker(unit="sentences")
+
+
+def test_unchanged_chunks_not_rewritten(record, tmp_path):
+    path = str(tmp_path / "chunks.jsonl")
+    chunker = Chunker(size=50, overlap=0)
+
+    writer = JSONLWriter(path, hash_key="chunk_hash")
+    assert all(writer.write(c) for c in chunker.chunk(record))
+    writer.close()
+
+    record["body_text"] = record["body_text"].replace("Inhalers help", "Inhalers and pills help")
+    writer = JSONLWriter(path, hash_key="chunk_hash")
+    written = [writer.write(c) for c in chunker.chunk(record)]
+    writer.close()
+
+    assert written == [False, False, True]
+
+
+def test_parquet_sink(record, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from scraper.core.writer import ParquetWriter
+
+    path = str(tmp_path / "chunks.parquet")
+    chunks = list(Chunker(size=50, overlap=0).chunk(record))
+
+    writer = ParquetWriter(path, CHUNK_SCHEMA, hash_key="chunk_hash", batch_size=2)
+    for c in chunks:
+        writer.write(c)
+    writer.close()
+
+    writer = ParquetWriter(path, CHUNK_SCHEMA, hash_key="chunk_hash")
+    assert not any(writer.write(c) for c in chunks)
+    writer.close()
+
+    table = pq.read_table(path)
+    assert table.num_rows == len(chunks)
+    assert table.column("heading").to_pylist() == [None, "Causes", "Treatment"]
@@ -0,0 +1,175 @@
+import pytest
+from scraper.core.crawler import Crawler
+
+
+class FakeResponse:
+    def __init__(self, body=b"", headers=None, status_code=200):
+        self.body = body
+        self.headers = headers or {}
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.closed = False
+        self.bytes_read = 0
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            chunk = self.body[i:i + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, get_resp, head_resp=None):
+        self.get_resp = get_resp
+        self.head_resp = head_resp
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", url, kwargs))
+        return self.get_resp
+
+    def head(self, url, **kwargs):
+        self.calls.append(("HEAD", url, kwargs))
+        return self.head_resp
+
+
+@pytest.fixture
+def config():
+    return {
+        "allowed_domains": ["example.com"],
+        "crawl": {"max_body_bytes": 100_000},
+    }
+
+
+@pytest.fixture
+def crawler(config, monkeypatch):
+    monkeypatch.setattr("scraper.core.crawler.time.sleep", lambda s: None)
+    return Crawler(config)
+
+
+def test_fetch_streams_and_decodes_html(crawler):
+    resp = FakeResponse("<p>café</p>".encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"})
+    crawler.session = FakeSession(resp)
+
+    assert crawler.fetch("https://example.com/a") == "<p>café</p>"
+    assert crawler.session.calls[0][2]["stream"] is True
+    assert resp.closed
+
+
+def test_fetch_uses_meta_charset(crawler):
+    body = '<meta charset="iso-8859-1"><p>café</p>'.encode("latin-1")
+    crawler.session = FakeSession(FakeResponse(body, {"Content-Type": "text/html"}))
+
+    assert "café" in crawler.fetch("https://example.com/a")
+
+
+def test_fetch_skips_non_html_without_reading_body(crawler):
+    resp = FakeResponse(b"%PDF-1.4" * 100, {"Content-Type": "application/pdf"})
+    crawler.session = FakeSession(resp)
+
+    assert crawler.fetch("https://example.com/doc") is None
+    assert resp.bytes_read == 0
+    assert len(crawler.session.calls) == 1  # not retried
+
+
+def test_fetch_aborts_oversized_body(crawler):
+    resp = FakeResponse(b"x" * 300_000, {"Content-Type": "text/html"})
+    crawler.session = FakeSession(resp)
+
+    assert crawler.fetch("https://example.com/huge") is None
+    assert resp.bytes_read < 300_000
+    assert resp.closed
+
+
+def test_fetch_rejects_declared_content_length(crawler):
+    resp = FakeResponse(b"<p>x</p>", {"Content-Type": "text/html", "Content-Length": "999999"})
+    crawler.session = FakeSession(resp)
+
+    assert crawler.fetch("https://example.com/big") is None
+    assert resp.bytes_read == 0
+
+
+def test_fetch_head_check_for_suspicious_extension(crawler):
+    head = FakeResponse(headers={"Content-Type": "application/pdf"})
+    crawler.session = FakeSession(FakeResponse(b"<p>x</p>"), head_resp=head)
+
+    assert crawler.fetch("https://example.com/file.pdf") is None
+    assert [c[0] for c in crawler.session.calls] == ["HEAD"]
+
+
+def test_fetch_head_check_allows_html(crawler):
+    head = FakeResponse(headers={"Content-Type": "text/html"})
+    get = FakeResponse(b"<p>ok</p>", {"Content-Type": "text/html"})
+    crawler.session = FakeSession(get, head_resp=head)
+
+    assert crawler.fetch("https://example.com/page.pdf") == "<p>ok</p>"
+    assert [c[0] for c in crawler.session.calls] == ["HEAD", "GET"]
+
+
+def test_crawl_filters_links_before_queueing(crawler, monkeypatch):
+    fetched = []
+
+    def fake_fetch(url):
+        fetched.append(url)
+        return "<html></html>"
+
+    monkeypatch.setattr(crawler, "fetch", fake_fetch)
+    links = {
+        "https://example.com/ok",
+        "https://example.com.evil.org/phish",
+        "https://other.com/page",
+    }
+    crawler.max_depth = 1
+
+    results = crawler.crawl(["https://example.com/"], lambda html, base: links)
+
+    assert fetched == ["https://example.com/", "https://example.com/ok"]
+    assert set(results) == {"https://example.com/", "https://example.com/ok"}
+
+
+def test_fetch_many_skips_urls_the_config_excludes(crawler, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(crawler, "fetch", lambda url: fetched.append(url) or "<html></html>")
+
+    results = crawler.fetch_many(["https://example.com/a", "https://other.com/b"])
+
+    assert fetched == ["https://example.com/a"]
+    assert list(results) == ["https://example.com/a"]
+
+
+def test_crawl_skip_predicate_and_page_limit(crawler, monkeypatch):
+    monkeypatch.setattr(crawler, "fetch", lambda url: "<html></html>")
+    links = {"https://example.com/known", "https://example.com/new1", "https://example.com/new2"}
+    crawler.max_depth = 1
+
+    results = crawler.crawl(
+        ["https://example.com/"], lambda html, base: links,
+        max_pages=2, skip=lambda url: url.endswith("known"),
+    )
+
+    assert len(results) == 2
+    assert "https://example.com/known" not in results
+
+
+def test_skipped_urls_are_not_checked_again(crawler):
+    html = FakeResponse(b'<a href="/doc.pdf">doc</a>', {"Content-Type": "text/html"})
+    head = FakeResponse(headers={"Content-Type": "application/pdf"})
+    crawler.session = FakeSession(html, head_resp=head)
+    crawler.max_depth = 2
+    links = {
+        "https://example.com/": {"https://example.com/a", "https://example.com/doc.pdf"},
+        "https://example.com/a": {"https://example.com/doc.pdf"},
+    }
+
+    crawler.crawl(["https://example.com/"], lambda html, base: links.get(base, set()))
+
+    heads = [c for c in crawler.session.calls if c[0] == "HEAD"]
+    assert len(heads) == 1
+    assert "https://example.com/doc.pdf" in crawler.visited
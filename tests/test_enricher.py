@@ -109,4 +109,15 @@ def test_enriched_contains_parsed_fields(enricher, parsed_doc):
     assert result["body_text"] == parsed_doc["body_text"]
     assert "word_count" in result
     assert "language" in result
-    assert "content_type" in result
\ No newline at end of file
+    assert "content_type" in result
+
+
+def test_enrich_batch_matches_enrich(enricher, parsed_doc):
+    docs = [parsed_doc, {"url": "https://example.com/empty", "body_text": ""}]
+    batch = enricher.enrich_batch(docs)
+
+    for doc, result in zip(docs, batch):
+        single = enricher.enrich(doc)
+        assert result["readability_score"] == single["readability_score"]
+        assert result["word_count"] == single["word_count"]
+        assert result["questions"] == single["questions"]
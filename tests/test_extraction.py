@@ -0,0 +1,118 @@
+import pytest
+from bs4 import BeautifulSoup
+from scraper.core.extraction import ExtractionPlan, CompiledSelector, load_plugin
+from scraper.core.parser import Parser
+
+HTML = """
+<html><head><title>Asthma | MedlinePlus</title></head>
+<body>
+  <h1>Asthma</h1>
+  <div class="also-called">Also called: <span>Bronchial asthma</span></div>
+  <div id="topic-summary">
+    <h2>What is asthma?</h2>
+    <p>Asthma is a chronic disease.</p>
+  </div>
+  <ul class="related">
+    <li><a href="/allergy.html">Allergy</a></li>
+    <li><a href="/copd.html">COPD</a></li>
+  </ul>
+</body></html>
+"""
+
+
+def plugin(soup, record):
+    return {"title_length": len(record["title"]), "link_count": len(soup.find_all("a"))}
+
+
+@pytest.fixture
+def config():
+    return {
+        "selectors": {
+            "title": "h1",
+            "content_containers": ["#topic-summary"],
+            "content_tags": ["p", "h2"],
+        },
+        "fields": {
+            "also_called": "div.also-called span",
+            "related_topics": {"selector": "ul.related a", "many": True},
+            "related_links": {"selector": "ul.related a", "attr": "href", "many": True},
+            "missing": ".does-not-exist",
+        },
+        "plugin": "test_extraction:plugin",
+    }
+
+
+def test_parse_with_fields_and_plugin(config):
+    record = Parser(config).parse(HTML, "https://medlineplus.gov/asthma.html")
+
+    assert record["title"] == "Asthma"
+    assert record["body_text"] == "What is asthma?\nAsthma is a chronic disease."
+    assert record["also_called"] == "Bronchial asthma"
+    assert record["related_topics"] == ["Allergy", "COPD"]
+    assert record["related_links"] == ["/allergy.html", "/copd.html"]
+    assert record["missing"] is None
+    assert record["title_length"] == 6
+    assert record["link_count"] == 2
+
+
+def test_plan_is_compiled_once(config):
+    parser = Parser(config)
+    plan = parser.plan
+    parser.parse(HTML, "u")
+    parser.parse(HTML, "u")
+
+    assert parser.plan is plan
+    assert isinstance(plan.title, CompiledSelector)
+
+
+def test_execute_finds_fallbacks():
+    plan = ExtractionPlan({"title": ".nope"})
+    found = plan.execute(BeautifulSoup(HTML, "html.parser"))
+
+    assert found.title is None
+    assert found.page_title.string == "Asthma | MedlinePlus"
+    # no containers configured -> all <p> tags
+    assert found.blocks == [("p", "Asthma is a chronic disease.")]
+
+
+@pytest.mark.parametrize("selector,expected", [
+    ("h1", ["h1"]),
+    ("#topic-summary", ["div"]),
+    ("div.also-called > span", ["span"]),
+    ("h2, ul.related a", ["h2", "a", "a"]),
+    ("ul :is(a)", ["a", "a"]),
+])
+def test_compiled_selector_matches_like_select(selector, expected):
+    soup = BeautifulSoup(HTML, "html.parser")
+    compiled = CompiledSelector(selector)
+
+    matched = [el.name for el in soup.find_all(True) if compiled.match(el)]
+    assert matched == [el.name for el in soup.select(selector)] == expected
+
+
+def test_invalid_plugin_spec():
+    with pytest.raises(ValueError):
+        load_plugin("no_function_given")
+
+
+NESTED = """
+<html><body>
+  <div class="a"><p>A1</p><div class="b"><p>B1</p></div></div>
+  <div class="b"><p>B2</p></div>
+</body></html>
+"""
+
+
+def test_content_blocks_keep_per_selector_order():
+    config = {"selectors": {"content_containers": [".b", ".a"], "content_tags": ["p"]}}
+    soup = BeautifulSoup(NESTED, "html.parser")
+
+    # same order as soup.select(container) + container.find_all(tags), per selector
+    expected = [
+        tag.get_text(" ", strip=True)
+        for selector in config["selectors"]["content_containers"]
+        for container in soup.select(selector)
+        for tag in container.find_all(["p"])
+    ]
+    assert expected == ["B1", "B2", "A1", "B1"]
+    assert Parser(config).parse(NESTED, "https://example.com")["body_text"] == "B1\nB2\nA1\nB1"
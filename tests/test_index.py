@@ -0,0 +1,106 @@
+import json
+import pytest
+from scraper.core.index import OutputIndex, file_fingerprint, read_records
+from scraper.core.writer import JSONLWriter
+from scraper.query import cli, run_query
+
+
+def make_record(n, keywords, language="en", readability=10.0):
+    return {
+        "url": f"https://example.com/{n}",
+        "title": f"Ünïcode page {n}",
+        "content_hash": f"hash{n}",
+        "keywords": keywords,
+        "language": language,
+        "text_length": "short",
+        "source_domain": "example.com",
+        "readability_score": readability,
+        "word_count": 50,
+    }
+
+
+@pytest.fixture
+def output(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    writer = JSONLWriter(path, index_path=path + ".idx")
+    writer.write(make_record(1, ["Asthma", "lungs"], readability=8.0))
+    writer.write(make_record(2, ["diabetes"], language="es", readability=14.0))
+    writer.write(make_record(3, ["asthma", "children"], readability=15.0))
+    writer.close()
+    return path
+
+
+def urls(records):
+    return [r["url"] for r in records]
+
+
+def test_keyword_lookup_seeks_records(output):
+    index = OutputIndex(output + ".idx")
+    offsets = index.query(keywords="asthma")
+    index.close()
+
+    assert urls(read_records(output, offsets)) == ["https://example.com/1", "https://example.com/3"]
+
+
+def test_combined_filters(output):
+    records = run_query(output, language="en", min_readability=12)
+    assert urls(records) == ["https://example.com/3"]
+
+    records = run_query(output, keywords=["asthma", "children"])
+    assert urls(records) == ["https://example.com/3"]
+
+
+def test_unknown_field_rejected(output):
+    index = OutputIndex(output + ".idx")
+    with pytest.raises(ValueError):
+        index.query(title="x")
+    index.close()
+
+
+def test_sync_indexes_existing_and_appended_records(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    writer = JSONLWriter(path)
+    writer.write(make_record(1, ["asthma"]))
+    writer.close()
+
+    # index created later catches up with the existing file
+    writer = JSONLWriter(path, index_path=path + ".idx")
+    writer.write(make_record(2, ["asthma"]))
+    writer.close()
+
+    assert len(list(run_query(path, keywords="asthma"))) == 2
+
+
+def test_overwrite_resets_index(output):
+    writer = JSONLWriter(output, overwrite=True, index_path=output + ".idx")
+    writer.write(make_record(9, ["flu"]))
+    writer.close()
+
+    assert urls(run_query(output, keywords="asthma")) == []
+    assert urls(run_query(output, keywords="flu")) == ["https://example.com/9"]
+
+
+def test_rewrite_without_index_triggers_rebuild(output):
+    index = OutputIndex(output + ".idx")
+    assert index.fingerprint == file_fingerprint(output)
+    index.close()
+
+    # rewritten by a writer that does not maintain the index, and larger than before
+    writer = JSONLWriter(output, overwrite=True)
+    for n in range(10, 16):
+        writer.write(make_record(n, ["flu"]))
+    writer.close()
+
+    assert urls(run_query(output, keywords="asthma")) == []
+    assert len(urls(run_query(output, keywords="flu"))) == 6
+
+
+def test_query_cli(output, capsys):
+    cli(["--output", output, "--keyword", "asthma", "--fields", "url,title"])
+    lines = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+
+    assert lines[0] == {"url": "https://example.com/1", "title": "Ünïcode page 1"}
+    assert len(lines) == 2
+
+    cli(["--output", output, "--language", "es", "--count"])
+    assert capsys.readouterr().out.strip() == "1"
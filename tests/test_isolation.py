@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from scraper.core.isolation import DeadLetterFile, PageProcessor
+from scraper.core.metrics import RunMetrics
+
+
+def plugin(soup, record):
+    if "slow" in record["url"]:
+        time.sleep(30)
+    if "boom" in record["url"]:
+        raise ValueError("pathological page")
+    return {}
+
+
+@pytest.fixture
+def config():
+    return {
+        "selectors": {"title": "h1", "content_tags": ["p"]},
+        "plugin": "test_isolation:plugin",
+        "enrichment": {"expected_language": "en"},
+    }
+
+
+def page(name):
+    return (f"https://example.com/{name}",
+            f"<html><body><h1>{name}</h1><p>This is the body text of the {name} page.</p></body></html>")
+
+
+def test_dead_letter_round_trip(tmp_path):
+    path = str(tmp_path / "out.dead.jsonl")
+    dead_letter = DeadLetterFile(path)
+    dead_letter.record("https://example.com/a", "enrich", "ValueError: bad", 12.34)
+    dead_letter.close()
+
+    (entry,) = DeadLetterFile.load(path)
+    assert entry["url"] == "https://example.com/a"
+    assert entry["stage"] == "enrich"
+    assert entry["elapsed_ms"] == 12.3
+    assert "failed_at" in entry
+
+
+def test_clean_run_creates_no_dead_letter_file(tmp_path):
+    dead_letter = DeadLetterFile(str(tmp_path / "out.dead.jsonl"))
+    dead_letter.close()
+    assert not (tmp_path / "out.dead.jsonl").exists()
+
+
+def test_replace_keeps_original_until_close(tmp_path):
+    path = str(tmp_path / "out.dead.jsonl")
+    original = DeadLetterFile(path)
+    original.record("https://example.com/a", "parse", "boom")
+    original.record("https://example.com/b", "parse", "boom")
+    original.close()
+
+    replay = DeadLetterFile(path, replace=True)
+    replay.record("https://example.com/b", "enrich", "still broken")
+    # an interrupted replay (no close) leaves every original entry in place
+    assert [e["url"] for e in DeadLetterFile.load(path)] == ["https://example.com/a", "https://example.com/b"]
+
+    replay.close()
+    assert [(e["url"], e["stage"]) for e in DeadLetterFile.load(path)] == [("https://example.com/b", "enrich")]
+
+
+def test_replace_without_failures_removes_file(tmp_path):
+    path = tmp_path / "out.dead.jsonl"
+    path.write_text('{"url": "https://example.com/a"}\n')
+
+    DeadLetterFile(str(path), replace=True).close()
+    assert not path.exists()
+
+
+def test_in_process_failures_are_dead_lettered(config, tmp_path):
+    metrics = RunMetrics()
+    dead_letter = DeadLetterFile(str(tmp_path / "dead.jsonl"))
+    processor = PageProcessor(config, workers=0, metrics=metrics, dead_letter=dead_letter)
+
+    results = dict(processor.process([page("ok"), page("boom")]))
+    dead_letter.close()
+
+    assert list(results) == ["https://example.com/ok"]
+    assert results["https://example.com/ok"]["title"] == "ok"
+    (entry,) = DeadLetterFile.load(dead_letter.path)
+    assert entry["stage"] == "parse" and "pathological page" in entry["error"]
+    assert metrics.counters["pages_processed"] == 1
+    assert metrics.counters["pages_failed"] == 1
+
+
+def test_worker_pool_skips_pages_over_the_time_limit(config, tmp_path):
+    metrics = RunMetrics()
+    dead_letter = DeadLetterFile(str(tmp_path / "dead.jsonl"))
+    processor = PageProcessor(config, workers=2, page_timeout=1.0, metrics=metrics, dead_letter=dead_letter)
+
+    start = time.monotonic()
+    pages = [page("a"), page("slow"), page("b"), page("boom"), page("c")]
+    results = dict(processor.process(pages))
+    processor.close()
+    dead_letter.close()
+
+    assert time.monotonic() - start < 15
+    assert set(results) == {f"https://example.com/{name}" for name in "abc"}
+    stages = {e["url"].rsplit("/", 1)[1]: e["stage"] for e in DeadLetterFile.load(dead_letter.path)}
+    assert stages == {"slow": "timeout", "boom": "parse"}
+    assert metrics.counters["pages_timed_out"] == 1
+    assert metrics.counters["worker_pool_restarts"] == 1
+    # metrics recorded inside the workers are merged back
+    assert metrics.timings["language_detect_ms"]["count"] == 3
+
+
+def test_from_config_reads_processing_section(config):
+    config["processing"] = {"workers": 4, "page_timeout": 5}
+    processor = PageProcessor.from_config(config, workers=1)
+    assert processor.workers == 1
+    assert processor.page_timeout == 5
@@ -0,0 +1,87 @@
+import pytest
+from scraper.core.language import LanguageDetector
+from scraper.core.metrics import RunMetrics
+
+ENGLISH = (
+    "Asthma is a chronic disease that affects your airways. The airways are tubes "
+    "that carry air in and out of your lungs. If you have asthma, the inside walls "
+    "of your airways become sore and swollen."
+)
+SPANISH = (
+    "El asma es una enfermedad crónica que afecta las vías respiratorias. Las vías "
+    "respiratorias son los tubos que llevan el aire hacia y desde los pulmones, y "
+    "cuando una persona tiene asma se inflaman."
+)
+
+
+def test_detects_without_expected_language():
+    detector = LanguageDetector()
+    assert detector.detect(ENGLISH) == "en"
+    assert detector.detect(SPANISH) == "es"
+
+
+def test_short_text_returns_default():
+    metrics = RunMetrics()
+    detector = LanguageDetector(default="en", metrics=metrics)
+
+    assert detector.detect("Too short") == "en"
+    assert metrics.counters["language_short"] == 1
+
+
+def test_expected_language_fast_path():
+    metrics = RunMetrics()
+    detector = LanguageDetector(expected_language="en", metrics=metrics)
+
+    assert detector.detect(ENGLISH) == "en"
+    assert metrics.counters["language_expected"] == 1
+    assert metrics.timings["language_detect_ms"]["count"] == 1
+
+
+def test_expected_language_is_verified():
+    metrics = RunMetrics()
+    detector = LanguageDetector(expected_language="en", metrics=metrics)
+
+    assert detector.detect(SPANISH) == "es"
+    assert metrics.counters["language_detected"] == 1
+
+
+def test_cache_by_content_hash(monkeypatch):
+    metrics = RunMetrics()
+    detector = LanguageDetector(metrics=metrics, cache_size=1)
+
+    assert detector.detect(ENGLISH, content_hash="h1") == "en"
+    monkeypatch.setattr(detector, "_detect", lambda text: pytest.fail("cache miss"))
+    assert detector.detect("ignored", content_hash="h1") == "en"
+    assert metrics.counters["language_cache_hits"] == 1
+
+
+def test_cache_is_bounded():
+    detector = LanguageDetector(cache_size=1)
+    detector.detect(ENGLISH, content_hash="h1")
+    detector.detect(SPANISH, content_hash="h2")
+
+    assert list(detector._cache) == ["h2"]
+
+
+def test_sample_is_bounded():
+    detector = LanguageDetector(sample_chars=50)
+    sample = detector._sample(ENGLISH * 10)
+
+    assert len(sample) <= 50
+    assert not sample.endswith(" ")
+
+
+def test_seeded_detection_is_deterministic():
+    text = "Bonjour hello hola ciao hallo olá " * 3
+    results = {LanguageDetector(seed=0).detect(text) for _ in range(5)}
+    assert len(results) == 1
+
+
+def test_from_config():
+    detector = LanguageDetector.from_config({
+        "enrichment": {"expected_language": "es", "language_detection": {"sample_chars": 500}}
+    })
+
+    assert detector.expected_language == "es"
+    assert detector.default == "es"
+    assert detector.sample_chars == 500
@@ -0,0 +1,66 @@
+import json
+import logging
+import pytest
+from scraper.core.logger import Logger, JsonFormatter, SamplingFilter, DuplicateFilter
+
+
+def make_record(msg, level=logging.ERROR, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_structured_fields():
+    record = make_record("Crawling: x", level=logging.INFO, url="https://x", depth=2, stage="crawl")
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "Crawling: x"
+    assert payload["level"] == "INFO"
+    assert payload["url"] == "https://x"
+    assert payload["depth"] == 2
+    assert payload["stage"] == "crawl"
+    assert "status" not in payload
+
+
+def test_sampling_filter_only_drops_debug():
+    f = SamplingFilter(rate=0.0)
+    assert f.filter(make_record("debug", level=logging.DEBUG)) is False
+    assert f.filter(make_record("info", level=logging.INFO)) is True
+
+
+def test_duplicate_filter_suppresses_within_window(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("scraper.core.logger.time.monotonic", lambda: now[0])
+    f = DuplicateFilter(window=5.0)
+
+    assert f.filter(make_record("boom", dedupe_key="fetch:Timeout")) is True
+    assert f.filter(make_record("boom again", dedupe_key="fetch:Timeout")) is False
+    assert f.filter(make_record("other")) is True
+
+    now[0] = 106.0
+    record = make_record("boom", dedupe_key="fetch:Timeout")
+    assert f.filter(record) is True
+    assert record.suppressed == 1
+    assert "suppressed 1 similar" in record.getMessage()
+
+
+def test_duplicate_filter_ignores_info():
+    f = DuplicateFilter(window=5.0)
+    assert f.filter(make_record("same", level=logging.INFO)) is True
+    assert f.filter(make_record("same", level=logging.INFO)) is True
+
+
+def test_queue_mode_writes_json_lines(tmp_logs):
+    Logger.configure(queue_mode=True, json_format=True)
+    log = Logger("scraper.test.queue").get()
+
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in log.handlers)
+
+    log.info("Crawling: https://x", extra={"url": "https://x", "depth": 1, "stage": "crawl"})
+    Logger.shutdown()
+
+    lines = (tmp_logs / "scraper.log").read_text().splitlines()
+    payload = json.loads(lines[-1])
+    assert payload["url"] == "https://x"
+    assert payload["depth"] == 1
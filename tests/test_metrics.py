@@ -0,0 +1,43 @@
+from scraper.core.metrics import RunMetrics
+
+
+def test_observe_aggregates():
+    metrics = RunMetrics()
+    metrics.observe("fetch_ms", 10.0)
+    metrics.observe("fetch_ms", 30.0)
+
+    stat = metrics.timings["fetch_ms"]
+    assert stat == {"count": 2, "total_ms": 40.0, "max_ms": 30.0}
+
+
+def test_timer_records_observation():
+    metrics = RunMetrics()
+    with metrics.timer("block_ms"):
+        pass
+
+    assert metrics.timings["block_ms"]["count"] == 1
+
+
+def test_merge_and_summary():
+    a, b = RunMetrics(), RunMetrics()
+    a.incr("pages")
+    b.incr("pages", 2)
+    b.observe("parse_ms", 5.0)
+
+    a.merge(b.as_dict())
+
+    assert a.counters["pages"] == 3
+    assert a.timings["parse_ms"]["count"] == 1
+    assert any(line.startswith("parse_ms: count=1") for line in a.summary())
+
+
+def test_gauge_keeps_maximum():
+    a, b = RunMetrics(), RunMetrics()
+    a.gauge_max("rss_peak_mb", 120.0)
+    a.gauge_max("rss_peak_mb", 80.0)
+    b.gauge_max("rss_peak_mb", 150.0)
+
+    a.merge(b)
+
+    assert a.gauges["rss_peak_mb"] == 150.0
+    assert "rss_peak_mb=150.0" in a.summary()
@@ -70,4 +70,13 @@ def test_parse_page(parser, complex_html):
     assert result["title"] == "Test Heading"
     assert result["description"] == "This is a sample description for testing."
     assert "First paragraph" in result["body_text"]
-    assert "Article paragraph inside" in result["body_text"]
\ No newline at end of file
+    assert "Article paragraph inside" in result["body_text"]
+
+
+def test_parse_headings():
+    parser = Parser({"selectors": {"content_containers": ["main"], "content_tags": ["h2", "p"]}})
+    html = "<main><h2>Causes</h2><p>Allergens.</p><h2>Treatment &amp; care</h2><p>Inhalers.</p></main>"
+    result = parser.parse(html, "https://example.com/x")
+
+    assert result["headings"] == ["Causes", "Treatment & care"]
+    assert result["body_text"].split("\n") == ["Causes", "Allergens.", "Treatment & care", "Inhalers."]
@@ -0,0 +1,153 @@
+import json
+import math
+import pytest
+from scraper.core.scheduler import RecrawlScheduler, estimate_change_rate, DAY
+
+HOUR = 3600
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    s = RecrawlScheduler(str(tmp_path / "state"), min_interval=HOUR, max_interval=10 * DAY,
+                         initial_interval=DAY)
+    yield s
+    s.close()
+
+
+def test_estimate_change_rate():
+    assert estimate_change_rate(0, 0, 100) is None
+    assert estimate_change_rate(4, 0, 4 * DAY) == 0
+    # every visit saw a change -> faster than one change per interval
+    assert estimate_change_rate(4, 4, 4 * DAY) > 1 / DAY
+    assert estimate_change_rate(4, 2, 4 * DAY) == pytest.approx(-math.log(2.5 / 4.5) / DAY)
+
+
+def test_first_fetch_is_new_and_due_after_initial_interval(scheduler):
+    assert scheduler.record("u1", "h1", fetched_at=0) is True
+
+    assert scheduler.due(10, now=DAY - 1) == []
+    assert scheduler.due(10, now=DAY) == ["u1"]
+
+
+def test_record_detects_changes(scheduler):
+    scheduler.record("u1", "h1", fetched_at=0)
+
+    assert scheduler.record("u1", "h1", fetched_at=DAY) is False
+    assert scheduler.record("u1", "h2", fetched_at=2 * DAY) is True
+
+
+def test_frequently_changing_pages_are_revisited_sooner(scheduler):
+    for i, day in enumerate(range(0, 5)):
+        scheduler.record("static", "same", fetched_at=day * DAY)
+        scheduler.record("busy", f"v{i}", fetched_at=day * DAY)
+
+    now = 4 * DAY
+    busy_due = scheduler.conn.execute("SELECT next_due FROM pages WHERE url='busy'").fetchone()[0]
+    static_due = scheduler.conn.execute("SELECT next_due FROM pages WHERE url='static'").fetchone()[0]
+
+    assert busy_due - now < static_due - now
+    assert static_due - now <= 10 * DAY
+    assert busy_due - now >= HOUR
+
+
+def test_due_respects_budget_and_order(scheduler):
+    scheduler.record("a", "h", fetched_at=0)
+    scheduler.record("b", "h", fetched_at=-HOUR)
+    scheduler.record("c", "h", fetched_at=HOUR)
+
+    assert scheduler.due(2, now=10 * DAY) == ["b", "a"]
+    assert scheduler.count() == 3
+
+
+def test_defer_pushes_back(scheduler):
+    scheduler.record("a", "h", fetched_at=0)
+    scheduler.defer("a", now=2 * DAY)
+
+    assert scheduler.due(10, now=2 * DAY) == []
+    assert scheduler.due(10, now=2 * DAY + HOUR) == ["a"]
+
+
+def test_changed_and_known_do_not_record(scheduler):
+    assert scheduler.changed("a", "h1") and not scheduler.known("a")
+    scheduler.record("a", "h1", fetched_at=0)
+
+    assert scheduler.known("a")
+    assert not scheduler.changed("a", "h1")
+    assert scheduler.changed("a", "h2")
+    # checking does not update the stored hash
+    assert scheduler.changed("a", "h2")
+
+    scheduler.forget("a")
+    assert not scheduler.known("a") and scheduler.count() == 0
+
+
+def test_state_persists(tmp_path):
+    path = str(tmp_path / "state")
+    s = RecrawlScheduler(path)
+    s.record("a", "h", fetched_at=0)
+    s.close()
+
+    s = RecrawlScheduler(path)
+    assert s.record("a", "h", fetched_at=DAY) is False
+    s.close()
+
+
+SITE = {
+    "https://example.com/": '<html><body><p>Start page text.</p><a href="/a">a</a></body></html>',
+    "https://example.com/a": "<html><body><p>Page a has some text about asthma.</p></body></html>",
+}
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """run_pipeline against a fake two-page site, with every page due again on the next run"""
+    from main import run_pipeline
+    from scraper.core.crawler import Crawler
+    from scraper.core.enricher import Enricher
+
+    fetches, enriched = [], []
+    monkeypatch.setattr(Crawler, "fetch", lambda self, url, retries=3: fetches.append(url) or SITE.get(url))
+    original_enrich = Enricher.enrich
+    monkeypatch.setattr(Enricher, "enrich", lambda self, parsed: enriched.append(parsed["url"]) or original_enrich(self, parsed))
+
+    config_path = tmp_path / "config.json"
+    # no crawl.max_pages: the crawler default applies to the recrawl budget too
+    config_path.write_text(json.dumps({
+        "allowed_domains": ["example.com"],
+        "start_urls": ["https://example.com/"],
+        "crawl": {"max_depth": 1},
+        "recrawl": {"initial_interval_hours": 0, "min_interval_hours": 0},
+    }))
+
+    def run(**kwargs):
+        fetches.clear()
+        enriched.clear()
+        run_pipeline(str(config_path), str(tmp_path / "out.jsonl"), recrawl=True, workers=0, **kwargs)
+
+    run.fetches, run.enriched = fetches, enriched
+    return run
+
+
+def test_recrawl_without_max_pages_in_config(pipeline):
+    pipeline()
+    pipeline()
+
+    # unchanged pages are revisited once each and never re-enriched
+    assert sorted(pipeline.fetches) == sorted(SITE)
+    assert pipeline.enriched == []
+
+    # an explicit budget of zero fetches nothing
+    pipeline(page_budget=0)
+    assert pipeline.fetches == []
+
+
+def test_recrawl_enriches_only_changed_pages(pipeline):
+    pipeline()
+    SITE_A = SITE["https://example.com/a"]
+    SITE["https://example.com/a"] = SITE_A.replace("asthma", "allergies")
+    try:
+        pipeline()
+    finally:
+        SITE["https://example.com/a"] = SITE_A
+
+    assert pipeline.enriched == ["https://example.com/a"]
@@ -0,0 +1,161 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from scraper.core.crawler import Crawler
+from scraper.core.metrics import RunMetrics
+from scraper.core.spill import MemoryBudget, peak_rss_mb, rss_mb
+from scraper.core.writer import JSONLWriter
+
+
+@pytest.fixture
+def budget(tmp_path):
+    budget = MemoryBudget(max_mb=10_000, metrics=RunMetrics(), directory=tmp_path)
+    yield budget
+    budget.close()
+
+
+def test_rss_is_positive():
+    assert rss_mb() > 0
+
+
+def test_set_keeps_contents_after_spill(budget):
+    seen = budget.set("seen")
+    seen.add("a")
+    seen.add("b")
+
+    seen.spill()
+    seen.add("b")
+    seen.add("c")
+
+    assert seen.spilled
+    assert "a" in seen and "c" in seen and "z" not in seen
+    assert len(seen) == 3
+
+
+def test_queue_stays_fifo_across_spill(budget):
+    queue = budget.queue("frontier", [("u1", 0), ("u2", 1)])
+    queue.spill()
+    queue.append(("u3", 1))
+
+    assert [queue.popleft() for _ in range(len(queue))] == [("u1", 0), ("u2", 1), ("u3", 1)]
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.popleft()
+
+
+def test_dict_keeps_insertion_order_across_spill(budget):
+    results = budget.dict("results")
+    results["b"] = "<b>"
+    results["a"] = "<a>"
+    results.spill()
+    results["c"] = "<c>"
+    results["a"] = "<a2>"
+
+    assert list(results.items()) == [("b", "<b>"), ("a", "<a2>"), ("c", "<c>")]
+    assert results["c"] == "<c>" and "z" not in results
+
+
+def test_enforce_spills_everything_over_budget(tmp_path):
+    metrics = RunMetrics()
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    budget = MemoryBudget(max_mb=1, metrics=metrics, directory=spill_dir)
+    visited = budget.set("visited")
+    visited.add("x")
+
+    assert budget.enforce()
+    assert visited.spilled and "x" in visited
+    # structures created after the spill go straight to disk
+    assert budget.set("later").spilled
+    assert metrics.counters["memory_spills"] == 1
+    assert metrics.gauges["rss_peak_mb"] > 1
+
+    budget.close()
+    assert not os.listdir(spill_dir)
+
+
+def test_crawl_under_tight_budget_matches_unbounded(tmp_path, monkeypatch):
+    monkeypatch.setattr("scraper.core.crawler.time.sleep", lambda s: None)
+    config = {"allowed_domains": ["example.com"], "crawl": {"max_depth": 2, "max_pages": 50}}
+    site = {f"https://example.com/{i}": {f"https://example.com/{i * 2 + 1}", f"https://example.com/{i * 2 + 2}"}
+            for i in range(20)}
+
+    def run(memory_budget):
+        crawler = Crawler(config, memory_budget=memory_budget)
+        monkeypatch.setattr(crawler, "fetch", lambda url: f"<html>{url}</html>")
+        results = crawler.crawl(["https://example.com/0"], lambda html, base: sorted(site.get(base, ())))
+        return list(results.items())
+
+    budget = MemoryBudget(max_mb=1, directory=tmp_path)
+    assert run(budget) == run(None)
+    assert budget.spilled
+    budget.close()
+
+
+def test_writer_dedupes_with_spilled_hashes(tmp_path, budget):
+    path = str(tmp_path / "out.jsonl")
+    writer = JSONLWriter(path, seen_hashes=budget.set("seen_hashes"))
+    assert writer.write({"content_hash": "h1"})
+    writer._seen_hashes.spill()
+    assert not writer.write({"content_hash": "h1"})
+    assert writer.write({"content_hash": "h2"})
+    writer.close()
+
+    # a fresh writer reloads existing hashes into a spillable set
+    reloaded = JSONLWriter(path, seen_hashes=budget.set("reloaded"))
+    assert not reloaded.write({"content_hash": "h2"})
+    reloaded.close()
+
+
+def test_spilled_lengths_are_tracked_without_counting_rows(budget):
+    seen, queue, results = budget.set("seen"), budget.queue("frontier"), budget.dict("results")
+    for structure in (seen, queue, results):
+        structure.spill()
+    statements = []
+    budget.conn.set_trace_callback(statements.append)
+
+    seen.add("a")
+    seen.add("a")
+    queue.append(("u1", 0))
+    queue.append(("u2", 0))
+    queue.popleft()
+    results["a"] = "<a>"
+    results["a"] = "<a2>"
+    results["b"] = "<b>"
+
+    assert (len(seen), len(queue), len(results)) == (1, 1, 2)
+    assert seen and queue and results
+    queue.popleft()
+    assert not queue
+    assert not any("COUNT" in sql for sql in statements)
+
+
+def test_peak_rss_unavailable_without_resource_module(monkeypatch):
+    monkeypatch.setattr("scraper.core.spill.resource", None)
+    assert peak_rss_mb() is None
+
+
+def test_pipeline_removes_spill_directory_on_error(tmp_path, monkeypatch):
+    from main import run_pipeline
+
+    spill_root = tmp_path / "tmp"
+    spill_root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spill_root))
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "allowed_domains": ["example.com"],
+        "start_urls": ["https://example.com/"],
+        "crawl": {},
+    }))
+
+    def failing_crawl(self, start_urls, link_extractor, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(Crawler, "crawl", failing_crawl)
+    with pytest.raises(KeyboardInterrupt):
+        run_pipeline(str(config_path), str(tmp_path / "out.jsonl"), max_memory_mb=512)
+
+    assert not os.listdir(spill_root)
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_main_defers_heavy_dependencies():
+    code = (
+        "import sys, main; "
+        "heavy = ['yake', 'langdetect', 'tldextract', 'requests', 'bs4']; "
+        "print(','.join(m for m in heavy if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+        capture_output=True, text=True,
+    ).stdout.strip()
+
+    assert out == ""
+
+
+def test_import_crawler_defers_requests():
+    code = (
+        "import sys, scraper.core.crawler; "
+        "print(','.join(m for m in ['requests', 'urllib3'] if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True,
+        capture_output=True, text=True,
+    ).stdout.strip()
+
+    assert out == ""
+
+
+def test_domain_extractor_uses_offline_snapshot():
+    from scraper.core.enricher import _domain_extractor
+
+    extractor = _domain_extractor()
+    assert extractor is _domain_extractor()
+    assert extractor.suffix_list_urls == ()
+    assert extractor("https://www.medlineplus.gov/x").suffix == "gov"
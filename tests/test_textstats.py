@@ -0,0 +1,63 @@
+import re
+import pytest
+from collections import Counter
+from scraper.core.textstats import TextStats, batch_readability
+
+
+def reference_readability(text):
+    """Multi-pass implementation the single-pass stats must reproduce"""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return 0.0
+    parts = re.split(r"[.!?]+", text)
+    sentences = max(1, len([p for p in parts if p.strip()]))
+    paras = [p.strip() for p in text.split("\n") if p.strip()]
+    counts = Counter(paras)
+    penalty = sum(v - 1 for v in counts.values() if v > 1) / len(paras) if paras else 0.0
+    score = (
+        0.4 * (len(words) / sentences) +
+        0.4 * (sum(len(w) for w in words) / len(words)) +
+        0.2 * penalty
+    )
+    return round(score, 3)
+
+
+TEXTS = [
+    "",
+    "   \n\n  ",
+    "...!!!",
+    "One sentence without end",
+    "Food allergies occur when the body reacts to certain foods.\n"
+    "What causes food allergies?\n"
+    "Common allergens include nuts, milk, and eggs.\n\n"
+    "How do you diagnose food allergies?\n"
+    "Testing usually involves skin or blood tests.",
+    "A sentence that spans\nseveral lines and ends here. Then, another\n, one!",
+    "Repeated line\nRepeated line\nRepeated line\nUnique line.",
+    "Numbers 3.14 and e.g. abbreviations? Yes! Wait... ok",
+    "Café naïve résumé — ünïcode wörds.",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_readability_matches_reference(text):
+    assert TextStats(text).readability == reference_readability(text)
+
+
+def test_single_pass_counts():
+    text = "What is asthma?\nAsthma is a disease. It affects airways.\nWhat is asthma?"
+    stats = TextStats(text)
+
+    assert stats.tokens == len(text.split())
+    assert stats.sentence_count == 4
+    assert stats.questions == ["What is asthma?", "What is asthma?"]
+    assert stats.redundancy == pytest.approx(1 / 3)
+
+
+def test_batch_readability_matches_single():
+    stats = [TextStats(t) for t in TEXTS]
+    assert batch_readability(stats) == [s.readability for s in stats]
+
+
+def test_batch_readability_empty():
+    assert batch_readability([]) == []
@@ -0,0 +1,78 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scraper.core.metrics import RunMetrics
+from scraper.core.transport import build_session, _accept_encoding
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"<html><p>ok</p></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.headers.get("Connection", "").lower() == "close":
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch_three(session, base):
+    for i in range(3):
+        resp = session.get(f"{base}/page{i}", timeout=5, stream=True)
+        b"".join(resp.iter_content(1024))
+        resp.close()
+
+
+def test_keep_alive_reuses_connections(server):
+    metrics = RunMetrics()
+    session = build_session({"transport": {"pool_maxsize": 2}}, metrics)
+    fetch_three(session, server)
+
+    assert metrics.counters["http_requests"] == 3
+    assert metrics.counters["http_connections_new"] == 1
+    assert metrics.counters["http_connections_reused"] == 2
+    assert metrics.timings["http_tcp_connect_ms"]["count"] == 1
+
+
+def test_keep_alive_disabled_opens_new_connections(server):
+    metrics = RunMetrics()
+    session = build_session({"transport": {"keep_alive": False}}, metrics)
+    fetch_three(session, server)
+
+    assert session.headers["Connection"] == "close"
+    assert metrics.counters["http_connections_new"] == 3
+    assert metrics.counters["http_connections_reused"] == 0
+
+
+def test_accept_encoding_only_lists_decodable(monkeypatch):
+    monkeypatch.setattr("scraper.core.transport.importlib.util.find_spec", lambda name: None)
+    assert _accept_encoding(["gzip", "br", "zstd", "deflate"]) == "gzip, deflate"
+
+
+def test_http2_session(server):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    metrics = RunMetrics()
+    session = build_session({"transport": {"http2": True}}, metrics)
+    fetch_three(session, server)
+
+    assert metrics.counters["http_requests"] == 3
+    assert session.headers["User-Agent"].startswith("multi-site-scraper")
+    session.close()
@@ -0,0 +1,72 @@
+import pytest
+from scraper.core.url_filter import UrlFilter
+
+
+@pytest.fixture
+def url_filter():
+    return UrlFilter(
+        ["medlineplus.gov"],
+        exclude_patterns=["/spanish/", ".swf", "re:/genetics/\\d+", "glob:*.pdf"],
+        include_patterns=[""],
+    )
+
+
+def test_allowed_domain_suffix_match(url_filter):
+    assert url_filter.allowed_domain("https://medlineplus.gov/a.html")
+    assert url_filter.allowed_domain("https://www.medlineplus.gov/a.html")
+    assert url_filter.allowed_domain("https://MedlinePlus.gov./a.html")
+
+
+def test_allowed_domain_rejects_lookalikes(url_filter):
+    assert not url_filter.allowed_domain("https://notmedlineplus.gov.evil.com/")
+    assert not url_filter.allowed_domain("https://notmedlineplus.gov/")
+    assert not url_filter.allowed_domain("https://gov/")
+    assert not url_filter.allowed_domain("mailto:someone@example.com")
+
+
+def test_exclude_pattern_types(url_filter):
+    assert url_filter.excluded("https://medlineplus.gov/spanish/asthma.html")
+    assert url_filter.excluded("https://medlineplus.gov/games/x.swf")
+    assert url_filter.excluded("https://medlineplus.gov/genetics/123")
+    assert url_filter.excluded("https://medlineplus.gov/docs/report.pdf")
+    assert not url_filter.excluded("https://medlineplus.gov/genetics/gene")
+    assert not url_filter.excluded("https://medlineplus.gov/pdf-guide.html")
+
+
+def test_empty_include_pattern_matches_everything(url_filter):
+    assert url_filter.included("https://medlineplus.gov/anything")
+
+
+def test_include_patterns_restrict():
+    f = UrlFilter(["example.com"], include_patterns=["/topics/", "re:/drugs/[a-z]+"])
+
+    assert f.allows("https://example.com/topics/asthma")
+    assert f.allows("https://example.com/drugs/aspirin")
+    assert not f.allows("https://example.com/about")
+
+
+def test_from_config():
+    f = UrlFilter.from_config({
+        "allowed_domains": ["example.com"],
+        "crawl": {"exclude_patterns": ["/login"]},
+    })
+
+    assert f.allows("https://sub.example.com/page")
+    assert not f.allows("https://example.com/login")
+
+
+def test_regex_patterns_compile_independently():
+    f = UrlFilter(
+        ["example.com"],
+        exclude_patterns=["/spanish/", "re:(?i)/login", r"re:/(\d+)/\1/"],
+    )
+
+    assert not f.allows("https://example.com/LOGIN")
+    assert not f.allows("https://example.com/7/7/page")
+    assert f.allows("https://example.com/7/8/page")
+    assert not f.allows("https://example.com/spanish/x")
+
+
+def test_invalid_regex_names_config_entry():
+    with pytest.raises(ValueError, match=r"crawl\.exclude_patterns: 're:/\(unclosed'"):
+        UrlFilter(["example.com"], exclude_patterns=["re:/(unclosed"])